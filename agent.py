@@ -5,42 +5,57 @@
 根据任务类型调用相应的任务处理函数
 """
 
-import json
-from typing import Any, Dict, Optional
+import io
+import os
+import re
+import sys
+import traceback
+from typing import Any, Callable, Dict, Optional, TextIO
 
-from colorama import Fore, Style, init
+try:
+    from colorama import Fore, Style, init
+except ImportError:
+    # 如果没有安装 colorama，退化为无颜色输出
 
-import nlu
-import tasks
-from config import Config
-
-# 初始化 colorama（用于彩色输出）
-init(autoreset=True)
+    class Fore:
+        CYAN = GREEN = YELLOW = RED = WHITE = ""
 
+    class Style:
+        RESET_ALL = ""
 
-class EmailAgent:
-    """智能邮件代理类"""
+    def init(autoreset: bool = False) -> None:
+        pass
 
-    def __init__(self):
-        """初始化邮件代理"""
-        self.nlu_engine = nlu.NLUEngine()
-        self.task_executor = tasks.TaskExecutor()
-        self.running = True
+from config import Config
 
-        print(f"{Fore.CYAN}{'=' * 70}")
-        print(f"{Fore.CYAN}{'智能邮件代理系统 v1.0':^70}")
-        print(f"{Fore.CYAN}{'=' * 70}")
-        print(f"{Fore.GREEN}✓ 系统已启动")
-        print(f"{Fore.YELLOW}  输入 'help' 查看帮助")
-        print(f"{Fore.YELLOW}  输入 'quit' 或 'exit' 退出系统")
-        print(f"{Fore.CYAN}{'=' * 70}\n")
+# 初始化 colorama（用于彩色输出）
+# 不使用 autoreset（否则每次写出后都会追加一次重置码），各输出块末尾显式重置颜色
+init(autoreset=False)
+
+# ==================== 预先生成的显示文本 ====================
+# 颜色常量在 init 之后即已确定，以下文本只需在导入时生成一次
+
+# 分隔线
+_HR = "=" * 70
+
+# 输入提示符
+_PROMPT = f"{Fore.GREEN}>>> {Style.RESET_ALL}"
+
+# 启动横幅
+_BANNER = f"""{Fore.CYAN}{_HR}
+{Fore.CYAN}{'智能邮件代理系统 v1.0':^70}
+{Fore.CYAN}{_HR}
+{Fore.GREEN}✓ 系统已启动
+{Fore.YELLOW}  输入 'help' 查看帮助
+{Fore.YELLOW}  输入 'quit' 或 'exit' 退出系统
+{Fore.CYAN}{_HR}{Style.RESET_ALL}
+"""
 
-    def display_help(self):
-        """显示帮助信息"""
-        help_text = f"""
-{Fore.CYAN}{"=" * 70}
+# 帮助信息
+_HELP_TEXT = f"""
+{Fore.CYAN}{_HR}
 {Fore.CYAN}{"帮助信息":^70}
-{Fore.CYAN}{"=" * 70}
+{Fore.CYAN}{_HR}
 
 {Fore.YELLOW}【单个邮件操作】{Style.RESET_ALL}
 
@@ -114,33 +129,182 @@ class EmailAgent:
    - quit   : 退出系统
    - exit   : 退出系统
 
-{Fore.CYAN}{"=" * 70}
+{Fore.CYAN}{_HR}{Style.RESET_ALL}
+"""
+
+# 配置信息模板（配置值在显示时填充）
+_CONFIG_TEMPLATE = f"""
+{Fore.CYAN}{_HR}
+{Fore.CYAN}{'当前配置信息':^70}
+{Fore.CYAN}{_HR}
+{Fore.YELLOW}邮箱账户:{Style.RESET_ALL} {{email_account}}
+{Fore.YELLOW}IMAP 服务器:{Style.RESET_ALL} {{imap_server}}:{{imap_port}}
+{Fore.YELLOW}SMTP 服务器:{Style.RESET_ALL} {{smtp_server}}:{{smtp_port}}
+{Fore.YELLOW}DeepSeek 模型:{Style.RESET_ALL} {{model}}
+{Fore.YELLOW}默认文件夹:{Style.RESET_ALL} {{default_folder}}
+{Fore.YELLOW}归档文件夹:{Style.RESET_ALL} {{archive_folder}}
+{Fore.CYAN}{_HR}{Style.RESET_ALL}
 """
-        print(help_text)
+# 非终端输出（重定向到文件、管道等）时，横幅和帮助信息预先编码为无颜色的字节串，
+# 直接写入底层缓冲区，跳过格式化、colorama 包装和逐次编码
+_STDOUT_IS_TTY = sys.stdout.isatty()
+_USE_RAW_STDOUT = not _STDOUT_IS_TTY and hasattr(sys.stdout, "buffer")
+_ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def _to_plain_bytes(text: str) -> bytes:
+    """去除颜色控制码并按标准输出的编码转为字节串（含末尾换行）"""
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    return (_ANSI_PATTERN.sub("", text) + "\n").encode(encoding, errors="replace")
+
+
+_BANNER_BYTES = _to_plain_bytes(_BANNER)
+_HELP_BYTES = _to_plain_bytes(_HELP_TEXT)
+
+
+def _print_static(text: str, raw: bytes) -> None:
+    """
+    输出预先生成的静态文本
+
+    Args:
+        text: 带颜色的文本（终端输出时使用）
+        raw: 预先编码的无颜色字节串（非终端输出时使用）
+    """
+    if _USE_RAW_STDOUT:
+        # 先刷新文本层，保证与之前的输出顺序一致
+        sys.stdout.flush()
+        sys.stdout.buffer.write(raw)
+        return
+    print(text)
+
+
+# 批量操作中视为成功的状态
+_SUCCESS_STATUSES = frozenset(
+    {
+        "success",
+        "archived",
+        "deleted",
+        "forwarded",
+        "marked_read",
+        "marked_unread",
+    }
+)
+
+# 批量操作结果中表示成功数量的字段（按优先级排列）
+_SUCCESS_COUNT_KEYS = ("archived", "deleted", "forwarded", "success_count", "marked")
+
+# 由专用渲染函数处理的结果数据键，通用显示时跳过
+_RENDERED_KEYS = frozenset(
+    {
+        "emails",
+        "summaries",
+        "results",
+        "priority_analysis",
+        "reply_content",
+        "summary",
+    }
+)
+
+
+class EmailAgent:
+    """智能邮件代理类"""
+
+    def __init__(self):
+        """初始化邮件代理"""
+        # NLU 引擎和任务执行器在首次使用时再创建（延迟导入 nlu/tasks 以加快启动）
+        self._nlu_engine = None
+        self._task_executor = None
+        self.running = True
+
+        # 非交互模式（管道/脚本输入）下直接读取 stdin，跳过 readline 处理
+        self._stdin_is_tty = sys.stdin.isatty()
+
+        # 系统命令分发表（命令 -> 处理函数，返回是否继续运行）
+        self._cmd_table: Dict[str, Callable[[], bool]] = {
+            "quit": self._quit,
+            "exit": self._quit,
+            "q": self._quit,
+            "help": self._wrap(self.display_help),
+            "config": self._wrap(self.display_config),
+            "clear": self._wrap(self.clear_screen),
+        }
+        self._max_cmd_len = max(map(len, self._cmd_table))
+
+        # 结果数据渲染表（数据键 -> 渲染函数，按匹配优先级排列）
+        self._renderers = (
+            ("emails", self._render_emails),
+            ("summaries", self._render_summaries),
+            ("results", self._render_batch),
+            ("priority_analysis", self._render_priority),
+            ("reply_content", self._render_reply),
+            ("summary", self._render_summary),
+        )
+
+        _print_static(_BANNER, _BANNER_BYTES)
+
+    def display_help(self):
+        """显示帮助信息"""
+        _print_static(_HELP_TEXT, _HELP_BYTES)
 
     def display_config(self):
         """显示当前配置"""
-        print(f"\n{Fore.CYAN}{'=' * 70}")
-        print(f"{Fore.CYAN}{'当前配置信息':^70}")
-        print(f"{Fore.CYAN}{'=' * 70}")
-        print(f"{Fore.YELLOW}邮箱账户:{Style.RESET_ALL} {Config.EMAIL_ACCOUNT}")
         print(
-            f"{Fore.YELLOW}IMAP 服务器:{Style.RESET_ALL} {Config.IMAP_SERVER}:{Config.IMAP_PORT}"
-        )
-        print(
-            f"{Fore.YELLOW}SMTP 服务器:{Style.RESET_ALL} {Config.SMTP_SERVER}:{Config.SMTP_PORT}"
+            _CONFIG_TEMPLATE.format(
+                email_account=Config.EMAIL_ACCOUNT,
+                imap_server=Config.IMAP_SERVER,
+                imap_port=Config.IMAP_PORT,
+                smtp_server=Config.SMTP_SERVER,
+                smtp_port=Config.SMTP_PORT,
+                model=Config.DEEPSEEK_MODEL,
+                default_folder=Config.DEFAULT_FOLDER,
+                archive_folder=Config.ARCHIVE_FOLDER,
+            )
         )
-        print(f"{Fore.YELLOW}DeepSeek 模型:{Style.RESET_ALL} {Config.DEEPSEEK_MODEL}")
-        print(f"{Fore.YELLOW}默认文件夹:{Style.RESET_ALL} {Config.DEFAULT_FOLDER}")
-        print(f"{Fore.YELLOW}归档文件夹:{Style.RESET_ALL} {Config.ARCHIVE_FOLDER}")
-        print(f"{Fore.CYAN}{'=' * 70}\n")
 
     def clear_screen(self):
         """清屏"""
-        import os
-
         os.system("cls" if os.name == "nt" else "clear")
 
+    @property
+    def nlu_engine(self):
+        """NLU 引擎（首次访问时导入 nlu 模块并创建）"""
+        if self._nlu_engine is None:
+            import nlu
+
+            self._nlu_engine = nlu.NLUEngine()
+        return self._nlu_engine
+
+    @property
+    def task_executor(self):
+        """任务执行器（首次访问时导入 tasks 模块并创建）"""
+        if self._task_executor is None:
+            import tasks
+
+            self._task_executor = tasks.TaskExecutor()
+        return self._task_executor
+
+    def _quit(self) -> bool:
+        """退出系统命令"""
+        print(f"{Fore.YELLOW}正在退出系统...{Style.RESET_ALL}")
+        return False
+
+    def _wrap(self, action: Callable[[], None]) -> Callable[[], bool]:
+        """
+        将显示类命令包装为系统命令处理函数
+
+        Args:
+            action: 要执行的操作
+
+        Returns:
+            Callable[[], bool]: 执行操作后返回 True（继续运行）的处理函数
+        """
+
+        def handler() -> bool:
+            action()
+            return True
+
+        return handler
+
     def process_input(self, user_input: str) -> bool:
         """
         处理用户输入
@@ -158,47 +322,38 @@ class EmailAgent:
         if not user_input:
             return True
 
-        # 系统命令处理
-        if user_input.lower() in ["quit", "exit", "q"]:
-            print(f"{Fore.YELLOW}正在退出系统...")
-            return False
-
-        if user_input.lower() == "help":
-            self.display_help()
-            return True
-
-        if user_input.lower() == "config":
-            self.display_config()
-            return True
-
-        if user_input.lower() == "clear":
-            self.clear_screen()
-            return True
+        # 系统命令处理（系统命令都是短 ASCII 单词，中文或长输入直接跳过）
+        if len(user_input) <= self._max_cmd_len and user_input.isascii():
+            handler = self._cmd_table.get(user_input.lower())
+            if handler is not None:
+                return handler()
 
         # 解析任务
-        print(f"{Fore.CYAN}→ 正在分析您的请求...")
+        print(f"{Fore.CYAN}→ 正在分析您的请求...{Style.RESET_ALL}")
         parse_result = self.parse_task(user_input)
 
         if not parse_result:
             print(f"{Fore.RED}✗ 无法理解您的请求，请重新输入")
-            print(f"{Fore.YELLOW}提示: 输入 'help' 查看使用示例")
+            print(f"{Fore.YELLOW}提示: 输入 'help' 查看使用示例{Style.RESET_ALL}")
             return True
 
         # 显示解析结果
         self.display_parse_result(parse_result)
 
         # 验证参数
-        is_valid, error_msg = nlu.validate_parameters(
-            parse_result["intent"], parse_result["parameters"]
-        )
+        intent = parse_result["intent"]
+        parameters = parse_result["parameters"]
+        is_valid, error_msg = self.nlu_engine.validate_parameters(intent, parameters)
 
         if not is_valid:
             print(f"{Fore.RED}✗ {error_msg}")
-            print(f"{Fore.YELLOW}提示: 请提供完整的信息，例如邮件ID或邮箱地址")
+            print(
+                f"{Fore.YELLOW}提示: 请提供完整的信息，例如邮件ID或邮箱地址{Style.RESET_ALL}"
+            )
             return True
 
         # 执行任务
-        print(f"{Fore.CYAN}→ 正在执行任务...")
+        print(f"{Fore.CYAN}→ 正在执行任务...{Style.RESET_ALL}")
         result = self.execute_task(parse_result)
 
         # 显示执行结果
@@ -217,15 +372,10 @@ class EmailAgent:
             Optional[Dict[str, Any]]: 解析结果
         """
         try:
-            result = self.nlu_engine.parse_task(user_input)
-
-            # 如果是未知意图且置信度很低，返回 None
-            if result["intent"] == "unknown" and result.get("confidence", 0) < 0.5:
-                return None
-
-            return result
+            # 未知意图且置信度很低时 NLU 引擎直接返回 None
+            return self.nlu_engine.parse_task(user_input, min_confidence=0.5)
         except Exception as e:
-            print(f"{Fore.RED}✗ 解析任务时出错: {str(e)}")
+            print(f"{Fore.RED}✗ 解析任务时出错: {str(e)}{Style.RESET_ALL}")
             return None
 
     def execute_task(self, parse_result: Dict[str, Any]) -> Dict[str, Any]:
@@ -264,16 +414,19 @@ class EmailAgent:
 
         print(f"\n{Fore.GREEN}✓ 识别意图: {intent_desc} (置信度: {confidence:.2f})")
 
-        if parse_result["parameters"]:
+        parameters = parse_result["parameters"]
+        if parameters:
             print(f"{Fore.YELLOW}  参数:")
-            for key, value in parse_result["parameters"].items():
+            for key, value in parameters.items():
                 if isinstance(value, list):
-                    print(
-                        f"{Fore.YELLOW}    - {key}: {', '.join(str(v) for v in value)}"
+                    # 单元素列表无需拼接
+                    formatted = (
+                        value[0] if len(value) == 1 else ", ".join(map(str, value))
                     )
+                    print(f"{Fore.YELLOW}    - {key}: {formatted}")
                 else:
                     print(f"{Fore.YELLOW}    - {key}: {value}")
-        print()
+        print(Style.RESET_ALL)
 
     def display_result(self, result: Dict[str, Any]):
         """
@@ -282,18 +435,22 @@ class EmailAgent:
         Args:
             result: 执行结果
         """
-        print(f"\n{Fore.CYAN}{'=' * 70}")
+        # 整个结果块先写入缓冲区，最后一次性输出
+        # （减少系统调用，Windows 下 colorama 也只需解析一次 ANSI 转义序列）
+        out = io.StringIO()
+        out.write(f"\n{Fore.CYAN}{_HR}\n")
 
         if result["success"]:
-            print(f"{Fore.GREEN}✓ {result['message']}")
+            out.write(f"{Fore.GREEN}✓ {result['message']}\n")
 
             # 显示详细数据
             if result["data"]:
-                self.display_result_data(result["data"])
+                self._render_result_data(result["data"], out)
         else:
-            print(f"{Fore.RED}✗ {result['message']}")
+            out.write(f"{Fore.RED}✗ {result['message']}\n")
 
-        print(f"{Fore.CYAN}{'=' * 70}\n")
+        out.write(f"{Fore.CYAN}{_HR}{Style.RESET_ALL}\n\n")
+        sys.stdout.write(out.getvalue())
 
     def display_result_data(self, data: Dict[str, Any]):
         """
@@ -302,143 +459,185 @@ class EmailAgent:
         Args:
             data: 结果数据
         """
-        # 特殊处理邮件列表
-        if "emails" in data:
-            print(f"\n{Fore.YELLOW}邮件列表:")
-            for email in data["emails"]:
-                index = email.get("index", "?")
-                subject = email.get("subject", "无主题")
-                from_name = email.get("from_name", "")
-                from_addr = email.get("from", "")
-                date = email.get("date", "")
-
-                print(f"{Fore.CYAN}  [{index}] {Fore.WHITE}{subject}")
-                print(f"      {Fore.YELLOW}发件人: {from_name} <{from_addr}>")
-                print(f"      {Fore.YELLOW}日期: {date}")
-                print()
-
-        # 特殊处理批量摘要
-        elif "summaries" in data:
-            print(f"\n{Fore.YELLOW}邮件摘要:")
-            for summary_item in data["summaries"]:
-                index = summary_item.get("index", "?")
-                subject = summary_item.get("subject", "无主题")
-                summary = summary_item.get("summary", "无摘要")
-
-                print(f"{Fore.CYAN}  [{index}] {Fore.WHITE}{subject}")
-                print(f"      {Fore.GREEN}摘要: {summary}")
-                print()
-
-        # 特殊处理批量操作结果
-        elif "results" in data and isinstance(data["results"], list):
-            total = data.get("total", 0)
-            success = data.get(
-                "archived",
-                data.get(
-                    "deleted",
-                    data.get(
-                        "forwarded", data.get("success_count", data.get("marked", 0))
-                    ),
-                ),
-            )
-            failed = data.get("failed", data.get("failed_count", 0))
-
-            print(f"\n{Fore.YELLOW}批量操作统计:")
-            print(f"  {Fore.CYAN}总数: {total}")
-            print(f"  {Fore.GREEN}成功: {success}")
-            print(f"  {Fore.RED}失败: {failed}")
-
-            # 显示详细结果（只显示失败的）
-            failed_items = [
-                r
-                for r in data["results"]
-                if r.get("status")
-                not in [
-                    "success",
-                    "archived",
-                    "deleted",
-                    "forwarded",
-                    "marked_read",
-                    "marked_unread",
-                ]
-            ]
-            if failed_items:
-                print(f"\n{Fore.RED}失败项目:")
-                for item in failed_items:
-                    if "subject" in item:
-                        print(
-                            f"  {Fore.YELLOW}• {item.get('subject', '未知')}: {item.get('status', '未知错误')}"
-                        )
-                    elif "recipient" in item:
-                        print(
-                            f"  {Fore.YELLOW}• {item.get('recipient', '未知')}: {item.get('status', '未知错误')}"
-                        )
-
-        # 特殊处理优先级分析
-        elif "priority_analysis" in data:
-            analysis = data["priority_analysis"]
-            print(f"\n{Fore.YELLOW}优先级分析:")
-            print(f"  {Fore.CYAN}优先级: {analysis.get('priority', '未知')}")
-            print(f"  {Fore.CYAN}紧急程度: {analysis.get('urgency', '未知')}")
-            print(
-                f"  {Fore.CYAN}是否重要: {'是' if analysis.get('is_important') else '否'}"
-            )
-            print(f"  {Fore.CYAN}建议操作: {analysis.get('suggested_action', '无')}")
-            print(f"  {Fore.YELLOW}理由: {analysis.get('reason', '无')}")
+        out = io.StringIO()
+        self._render_result_data(data, out)
+        out.write(Style.RESET_ALL)
+        sys.stdout.write(out.getvalue())
 
-        # 特殊处理回复内容
-        elif "reply_content" in data:
-            print(f"\n{Fore.YELLOW}生成的回复:")
-            print(f"{Fore.WHITE}{data['reply_content']}")
+    def _render_result_data(self, data: Dict[str, Any], out: TextIO):
+        """
+        将结果数据渲染到缓冲区
 
-        # 特殊处理摘要
-        elif "summary" in data:
-            print(f"\n{Fore.YELLOW}邮件摘要:")
-            print(f"{Fore.WHITE}{data['summary']}")
+        Args:
+            data: 结果数据
+            out: 输出缓冲区
+        """
+        # 按顺序查找第一个匹配的专用渲染函数
+        for key, renderer in self._renderers:
+            if key in data:
+                # 批量操作结果必须是列表
+                if key == "results" and not isinstance(data["results"], list):
+                    continue
+                renderer(data, out)
+                return
 
         # 通用数据显示
-        else:
-            print(f"\n{Fore.YELLOW}详细信息:")
-            for key, value in data.items():
-                if key not in [
-                    "emails",
-                    "summaries",
-                    "results",
-                    "priority_analysis",
-                    "reply_content",
-                    "summary",
-                ]:
-                    if isinstance(value, (dict, list)):
-                        print(
-                            f"  {Fore.CYAN}{key}: {json.dumps(value, ensure_ascii=False, indent=2)}"
+        self._render_generic(data, out)
+
+    def _render_emails(self, data: Dict[str, Any], out: TextIO):
+        """显示邮件列表"""
+        write = out.write
+        write(f"\n{Fore.YELLOW}邮件列表:\n")
+        for email in data["emails"]:
+            index = email.get("index", "?")
+            subject = email.get("subject", "无主题")
+            from_name = email.get("from_name", "")
+            from_addr = email.get("from", "")
+            date = email.get("date", "")
+
+            write(f"{Fore.CYAN}  [{index}] {Fore.WHITE}{subject}\n")
+            write(f"      {Fore.YELLOW}发件人: {from_name} <{from_addr}>\n")
+            write(f"      {Fore.YELLOW}日期: {date}\n\n")
+
+    def _render_summaries(self, data: Dict[str, Any], out: TextIO):
+        """显示批量摘要"""
+        write = out.write
+        write(f"\n{Fore.YELLOW}邮件摘要:\n")
+        for summary_item in data["summaries"]:
+            index = summary_item.get("index", "?")
+            subject = summary_item.get("subject", "无主题")
+            summary = summary_item.get("summary", "无摘要")
+
+            write(f"{Fore.CYAN}  [{index}] {Fore.WHITE}{subject}\n")
+            write(f"      {Fore.GREEN}摘要: {summary}\n\n")
+
+    def _render_batch(self, data: Dict[str, Any], out: TextIO):
+        """显示批量操作结果"""
+        total = data.get("total", 0)
+        success = next((data[key] for key in _SUCCESS_COUNT_KEYS if key in data), 0)
+        failed = data.get("failed", data.get("failed_count", 0))
+
+        write = out.write
+        write(f"\n{Fore.YELLOW}批量操作统计:\n")
+        write(f"  {Fore.CYAN}总数: {total}\n")
+        write(f"  {Fore.GREEN}成功: {success}\n")
+        write(f"  {Fore.RED}失败: {failed}\n")
+
+        # 显示详细结果（只显示失败的）
+        failed_items = [
+            r for r in data["results"] if r.get("status") not in _SUCCESS_STATUSES
+        ]
+        if failed_items:
+            write(f"\n{Fore.RED}失败项目:\n")
+            for item in failed_items:
+                if "subject" in item:
+                    write(
+                        f"  {Fore.YELLOW}• {item.get('subject', '未知')}: {item.get('status', '未知错误')}\n"
+                    )
+                elif "recipient" in item:
+                    write(
+                        f"  {Fore.YELLOW}• {item.get('recipient', '未知')}: {item.get('status', '未知错误')}\n"
+                    )
+
+    def _render_priority(self, data: Dict[str, Any], out: TextIO):
+        """显示优先级分析"""
+        analysis = data["priority_analysis"]
+        write = out.write
+        write(f"\n{Fore.YELLOW}优先级分析:\n")
+        write(f"  {Fore.CYAN}优先级: {analysis.get('priority', '未知')}\n")
+        write(f"  {Fore.CYAN}紧急程度: {analysis.get('urgency', '未知')}\n")
+        write(f"  {Fore.CYAN}是否重要: {'是' if analysis.get('is_important') else '否'}\n")
+        write(f"  {Fore.CYAN}建议操作: {analysis.get('suggested_action', '无')}\n")
+        write(f"  {Fore.YELLOW}理由: {analysis.get('reason', '无')}\n")
+
+    def _render_reply(self, data: Dict[str, Any], out: TextIO):
+        """显示生成的回复"""
+        out.write(f"\n{Fore.YELLOW}生成的回复:\n")
+        out.write(f"{Fore.WHITE}{data['reply_content']}\n")
+
+    def _render_summary(self, data: Dict[str, Any], out: TextIO):
+        """显示单封邮件摘要"""
+        out.write(f"\n{Fore.YELLOW}邮件摘要:\n")
+        out.write(f"{Fore.WHITE}{data['summary']}\n")
+
+    def _render_generic(self, data: Dict[str, Any], out: TextIO):
+        """通用数据显示"""
+        write = out.write
+        write(f"\n{Fore.YELLOW}详细信息:\n")
+        for key, value in data.items():
+            if key not in _RENDERED_KEYS:
+                if isinstance(value, (dict, list)):
+                    write(f"  {Fore.CYAN}{key}: ")
+                    # 此分支很少用到，JSON 编码器只在这里按需导入
+                    try:
+                        import orjson
+
+                        write(
+                            orjson.dumps(
+                                value,
+                                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                            ).decode()
                         )
-                    else:
-                        print(f"  {Fore.CYAN}{key}: {value}")
+                    except (ImportError, TypeError):
+                        # orjson 不可用，或遇到其不支持的值（如超出 64 位的整数）时回退到标准库
+                        import json
+
+                        # 直接流式写入缓冲区，避免先构建完整的格式化字符串
+                        json.dump(value, out, ensure_ascii=False, indent=2)
+                    write("\n")
+                else:
+                    write(f"  {Fore.CYAN}{key}: {value}\n")
+
+    def _read_line(self, prompt: str) -> str:
+        """
+        读取一行用户输入
+
+        Args:
+            prompt: 输入提示符
+
+        Returns:
+            str: 用户输入（不含换行符）
+
+        Raises:
+            EOFError: 输入结束
+        """
+        if self._stdin_is_tty:
+            # 交互模式保留 input() 的行编辑和历史记录
+            return input(prompt)
+
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip("\n")
 
     def run(self):
         """运行主循环"""
+        # 循环中反复使用的方法先绑定为局部变量
+        read_line = self._read_line
+        process_input = self.process_input
+
         while self.running:
             try:
                 # 获取用户输入
-                user_input = input(f"{Fore.GREEN}>>> {Style.RESET_ALL}")
+                user_input = read_line(_PROMPT)
 
                 # 处理输入
-                self.running = self.process_input(user_input)
+                self.running = process_input(user_input)
 
             except KeyboardInterrupt:
-                print(f"\n{Fore.YELLOW}检测到 Ctrl+C，正在退出...")
+                print(f"\n{Fore.YELLOW}检测到 Ctrl+C，正在退出...{Style.RESET_ALL}")
                 self.running = False
             except EOFError:
-                print(f"\n{Fore.YELLOW}检测到 EOF，正在退出...")
+                print(f"\n{Fore.YELLOW}检测到 EOF，正在退出...{Style.RESET_ALL}")
                 self.running = False
             except Exception as e:
-                print(f"{Fore.RED}✗ 发生错误: {str(e)}")
+                print(f"{Fore.RED}✗ 发生错误: {str(e)}{Style.RESET_ALL}")
                 if Config.DEBUG_MODE:
-                    import traceback
-
                     traceback.print_exc()
 
-        print(f"{Fore.CYAN}感谢使用智能邮件代理系统！")
+        print(f"{Fore.CYAN}感谢使用智能邮件代理系统！{Style.RESET_ALL}")
 
 
 def main():
@@ -447,7 +646,7 @@ def main():
         # 验证配置
         if not Config.validate_config():
             print(f"{Fore.RED}✗ 配置验证失败，请检查配置文件")
-            print(f"{Fore.YELLOW}提示: 请在 .env 文件中设置邮箱账户和 API 密钥")
+            print(f"{Fore.YELLOW}提示: 请在 .env 文件中设置邮箱账户和 API 密钥{Style.RESET_ALL}")
             return
 
         # 创建并运行代理
@@ -455,10 +654,8 @@ def main():
         agent.run()
 
     except Exception as e:
-        print(f"{Fore.RED}✗ 系统启动失败: {str(e)}")
+        print(f"{Fore.RED}✗ 系统启动失败: {str(e)}{Style.RESET_ALL}")
         if Config.DEBUG_MODE:
-            import traceback
-
             traceback.print_exc()
 
 
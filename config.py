@@ -3,17 +3,81 @@
 存放系统的配置项，包括邮件账户、IMAP/SMTP服务器设置、大模型API配置等
 """
 
+import marshal
 import os
+import stat
 from typing import Any, Dict
 
-# 尝试加载 .env 文件（如果存在）
-try:
-    from dotenv import load_dotenv
+# 环境变量在进程启动后不再变化，直接绑定 os.environ.get，省去 os.getenv 的包装调用
+_getenv = os.environ.get
 
-    load_dotenv()
-except ImportError:
-    # 如果没有安装 python-dotenv，忽略
-    pass
+# 布尔型环境变量视为真的取值（集合查找，无需先转小写）
+_TRUE_VALUES = frozenset(
+    ("1", "true", "True", "TRUE", "yes", "Yes", "YES", "on", "On", "ON")
+)
+
+# .env 文件路径（与本模块位于同一目录）
+_ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+
+# .env 解析结果的缓存文件（marshal 格式，按源文件 mtime 和大小校验）
+_ENV_CACHE_FILE = _ENV_FILE + ".cache"
+
+
+def _load_env_file() -> None:
+    """
+    加载 .env 文件到环境变量（不覆盖已存在的变量）
+
+    解析结果以 marshal 格式缓存到 .env.cache，源文件未变化时直接读取缓存，
+    无需再逐行解析 .env 文本
+    """
+    try:
+        st = os.stat(_ENV_FILE)
+    except OSError:
+        return
+
+    # 只接受普通文件，避免 .env 是 FIFO 等特殊文件时读取阻塞
+    if not stat.S_ISREG(st.st_mode):
+        return
+
+    signature = (st.st_mtime_ns, st.st_size)
+    env_vars = None
+
+    try:
+        with open(_ENV_CACHE_FILE, "rb") as f:
+            cached = marshal.load(f)
+        if cached["signature"] == signature:
+            env_vars = cached["vars"]
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        pass
+
+    if env_vars is None:
+        try:
+            from dotenv import dotenv_values
+        except ImportError:
+            # 如果没有安装 python-dotenv，忽略
+            return
+
+        env_vars = {
+            key: value
+            for key, value in dotenv_values(_ENV_FILE).items()
+            if value is not None
+        }
+
+        # 缓存文件包含敏感信息，仅允许当前用户读写
+        try:
+            fd = os.open(_ENV_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump({"signature": signature, "vars": env_vars}, f)
+        except OSError:
+            pass
+
+    for key, value in env_vars.items():
+        os.environ.setdefault(key, value)
+
+
+# 仅当必需的环境变量缺失时才加载 .env 文件（生产环境通常已由外部注入）
+if not (_getenv("EMAIL_ACCOUNT") and _getenv("DEEPSEEK_API_KEY")):
+    _load_env_file()
 
 
 class Config:
@@ -21,51 +85,60 @@ class Config:
 
     # ==================== 邮件账户配置 ====================
     # 邮件账户名（从环境变量读取，必须设置）
-    EMAIL_ACCOUNT: str = os.getenv("EMAIL_ACCOUNT", "")
+    EMAIL_ACCOUNT: str = _getenv("EMAIL_ACCOUNT", "")
 
     # 邮件账户密码或应用专用密码（从环境变量读取，必须设置）
-    EMAIL_PASSWORD: str = os.getenv("EMAIL_PASSWORD", "")
+    EMAIL_PASSWORD: str = _getenv("EMAIL_PASSWORD", "")
 
     # ==================== IMAP 服务器配置 ====================
     # IMAP 服务器地址
-    IMAP_SERVER: str = os.getenv("IMAP_SERVER", "imap.qq.com")
+    IMAP_SERVER: str = _getenv("IMAP_SERVER", "imap.qq.com")
 
     # IMAP 服务器端口（默认993为SSL端口）
-    IMAP_PORT: int = int(os.getenv("IMAP_PORT", "993"))
+    IMAP_PORT: int = int(_getenv("IMAP_PORT", "993"))
 
     # 是否使用SSL连接
-    IMAP_USE_SSL: bool = os.getenv("IMAP_USE_SSL", "True").lower() == "true"
+    IMAP_USE_SSL: bool = _getenv("IMAP_USE_SSL", "True") in _TRUE_VALUES
+
+    # IMAP 空闲保活间隔（秒），定时发送 NOOP 防止连接被服务器或 NAT 断开，0 表示关闭
+    IMAP_KEEPALIVE_INTERVAL: int = int(_getenv("IMAP_KEEPALIVE_INTERVAL", "540"))
+
+    # IMAP 连接池上限，每个连接保持选中各自的文件夹以减少 SELECT 切换，1 表示单连接
+    IMAP_POOL_SIZE: int = int(_getenv("IMAP_POOL_SIZE", "3"))
 
     # ==================== SMTP 服务器配置 ====================
     # SMTP 服务器地址
-    SMTP_SERVER: str = os.getenv("SMTP_SERVER", "smtp.qq.com")
+    SMTP_SERVER: str = _getenv("SMTP_SERVER", "smtp.qq.com")
 
     # SMTP 服务器端口（默认465为SSL端口，587为TLS端口）
-    SMTP_PORT: int = int(os.getenv("SMTP_PORT", "465"))
+    SMTP_PORT: int = int(_getenv("SMTP_PORT", "465"))
 
     # 是否使用SSL连接
-    SMTP_USE_SSL: bool = os.getenv("SMTP_USE_SSL", "True").lower() == "true"
+    SMTP_USE_SSL: bool = _getenv("SMTP_USE_SSL", "True") in _TRUE_VALUES
 
     # 是否使用TLS连接
-    SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "False").lower() == "true"
+    SMTP_USE_TLS: bool = _getenv("SMTP_USE_TLS", "False") in _TRUE_VALUES
 
     # ==================== DeepSeek API 配置 ====================
     # DeepSeek API 的 URL 地址
-    DEEPSEEK_API_URL: str = os.getenv(
+    DEEPSEEK_API_URL: str = _getenv(
         "DEEPSEEK_API_URL", "https://api.deepseek.com/v1/chat/completions"
     )
 
     # DeepSeek API 的密钥（从环境变量读取，必须设置）
-    DEEPSEEK_API_KEY: str = os.getenv("DEEPSEEK_API_KEY", "")
+    DEEPSEEK_API_KEY: str = _getenv("DEEPSEEK_API_KEY", "")
 
     # DeepSeek 模型名称
-    DEEPSEEK_MODEL: str = os.getenv("DEEPSEEK_MODEL", "deepseek-chat")
+    DEEPSEEK_MODEL: str = _getenv("DEEPSEEK_MODEL", "deepseek-chat")
 
     # API 请求超时时间（秒）
-    API_TIMEOUT: int = int(os.getenv("API_TIMEOUT", "30"))
+    API_TIMEOUT: int = int(_getenv("API_TIMEOUT", "30"))
 
     # API 请求最大重试次数
-    API_MAX_RETRIES: int = int(os.getenv("API_MAX_RETRIES", "3"))
+    API_MAX_RETRIES: int = int(_getenv("API_MAX_RETRIES", "3"))
+
+    # 批量处理时的最大并发 API 请求数
+    API_MAX_CONCURRENCY: int = int(_getenv("API_MAX_CONCURRENCY", "4"))
 
     # ==================== 邮件处理配置 ====================
     # 默认邮件文件夹
@@ -98,30 +171,42 @@ class Config:
     TRASH_FOLDER: str = FOLDER_NAMES["trash"][0]
 
     # 每次获取的最大邮件数量
-    MAX_EMAILS_FETCH: int = int(os.getenv("MAX_EMAILS_FETCH", "50"))
+    MAX_EMAILS_FETCH: int = int(_getenv("MAX_EMAILS_FETCH", "50"))
 
     # ==================== 系统配置 ====================
     # 日志级别（DEBUG, INFO, WARNING, ERROR, CRITICAL）
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL: str = _getenv("LOG_LEVEL", "INFO")
 
     # 日志文件路径
-    LOG_FILE: str = os.getenv("LOG_FILE", "email_agent.log")
+    LOG_FILE: str = _getenv("LOG_FILE", "email_agent.log")
 
     # 是否启用调试模式
-    DEBUG_MODE: bool = os.getenv("DEBUG_MODE", "False").lower() == "true"
+    DEBUG_MODE: bool = _getenv("DEBUG_MODE", "False") in _TRUE_VALUES
 
     # ==================== 大模型参数配置 ====================
     # 生成回复时的温度参数（0-2之间，越高越随机）
-    REPLY_TEMPERATURE: float = float(os.getenv("REPLY_TEMPERATURE", "0.7"))
+    REPLY_TEMPERATURE: float = float(_getenv("REPLY_TEMPERATURE", "0.7"))
 
     # 生成回复的最大token数
-    REPLY_MAX_TOKENS: int = int(os.getenv("REPLY_MAX_TOKENS", "500"))
+    REPLY_MAX_TOKENS: int = int(_getenv("REPLY_MAX_TOKENS", "500"))
 
     # 摘要生成的最大token数
-    SUMMARY_MAX_TOKENS: int = int(os.getenv("SUMMARY_MAX_TOKENS", "200"))
+    SUMMARY_MAX_TOKENS: int = int(_getenv("SUMMARY_MAX_TOKENS", "200"))
 
     # 意图识别的最大token数
-    INTENT_MAX_TOKENS: int = int(os.getenv("INTENT_MAX_TOKENS", "100"))
+    INTENT_MAX_TOKENS: int = int(_getenv("INTENT_MAX_TOKENS", "100"))
+
+    # 必需的配置项（validate_config 使用）
+    _REQUIRED_FIELDS = (
+        "EMAIL_ACCOUNT",
+        "EMAIL_PASSWORD",
+        "IMAP_SERVER",
+        "SMTP_SERVER",
+        "DEEPSEEK_API_KEY",
+    )
+
+    # get_config_dict 的缓存（配置被修改时置为 None）
+    _config_dict_cache = None
 
     @classmethod
     def get_config_dict(cls) -> Dict[str, Any]:
@@ -131,11 +216,13 @@ class Config:
         Returns:
             Dict[str, Any]: 包含所有配置项的字典
         """
-        return {
-            key: value
-            for key, value in cls.__dict__.items()
-            if not key.startswith("_") and not callable(value)
-        }
+        if cls._config_dict_cache is None:
+            cls._config_dict_cache = {
+                key: value
+                for key, value in cls.__dict__.items()
+                if not key.startswith("_") and not callable(value)
+            }
+        return cls._config_dict_cache.copy()
 
     @classmethod
     def validate_config(cls) -> bool:
@@ -145,21 +232,17 @@ class Config:
         Returns:
             bool: 配置是否有效
         """
-        # 检查必需的配置项
-        required_fields = [
-            "EMAIL_ACCOUNT",
-            "EMAIL_PASSWORD",
-            "IMAP_SERVER",
-            "SMTP_SERVER",
-            "DEEPSEEK_API_KEY",
+        # 检查必需的配置项，一次性报告所有缺失项
+        missing = [
+            field for field in cls._REQUIRED_FIELDS if not getattr(cls, field, None)
         ]
-
-        for field in required_fields:
-            value = getattr(cls, field, None)
-            if not value:
-                print(f"错误: 配置项 {field} 未设置")
-                print(f"请设置环境变量 {field} 或创建 .env 文件")
-                return False
+        if missing:
+            fields = ", ".join(missing)
+            print(
+                f"错误: 配置项 {fields} 未设置\n"
+                f"请设置环境变量 {fields} 或创建 .env 文件"
+            )
+            return False
 
         return True
 
@@ -232,6 +315,8 @@ def setup_email_provider(provider: str) -> None:
         provider_config = EMAIL_PROVIDERS[provider.lower()]
         for key, value in provider_config.items():
             setattr(Config, key, value)
+        # 配置已变更，使缓存的配置字典失效
+        Config._config_dict_cache = None
         print(f"已设置 {provider} 邮件服务器配置")
     else:
         print(f"不支持的邮件服务商: {provider}")
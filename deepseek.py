@@ -3,18 +3,195 @@
 负责调用 DeepSeek API 进行邮件内容分析、自动回复生成、情感分析等
 """
 
+import copy
+import functools
+import hashlib
 import json
-import time
-from typing import Any, Dict, List, Optional
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from config import Config
 
+_log = logging.getLogger(__name__)
+
+# orjson 为可选依赖，安装后用于更快地序列化和解析 JSON（直接处理 bytes）
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，异常处理无需区分
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        """将对象序列化为紧凑的 UTF-8 JSON 字节串"""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+# 用于从模型响应中解码 JSON 对象
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str) -> Optional[Any]:
+    """
+    从模型响应中提取第一个 JSON 对象
+
+    模型有时会在JSON前后添加说明文字，这里从第一个 "{" 开始解码，
+    对象结束即停止，不受后面文字中花括号的影响
+
+    Args:
+        text: 模型返回的文本
+
+    Returns:
+        Optional[Any]: 解析出的对象，文本中没有 "{" 时返回 None
+
+    Raises:
+        json.JSONDecodeError: 从第一个 "{" 开始的内容不是有效的JSON
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    return _JSON_DECODER.raw_decode(text, start)[0]
+
+
+# ==================== 提示词模板 ====================
+# 模板中不变的部分预先定义为模块常量，调用时只需拼接变化的内容
+
+_ANALYZE_PROMPT_HEAD = """请分析以下邮件内容，并以JSON格式返回分析结果：
+
+邮件内容：
+"""
+
+_ANALYZE_PROMPT_TAIL = """
+
+请返回以下信息（必须是有效的JSON格式）：
+{
+    "category": "邮件分类（工作/个人/营销/通知/其他）",
+    "sentiment": "情感倾向（积极/中性/消极）",
+    "urgency": "紧急程度（高/中/低）",
+    "topics": ["主题1", "主题2"],
+    "summary": "简短摘要（一句话）"
+}"""
+
+_REPLY_PROMPT_HEAD = """请根据以下邮件内容生成一封专业、礼貌的回复邮件：
+
+原始邮件：
+"""
+
+_REPLY_PROMPT_TAIL = """
+
+要求：
+1. 回复要简洁明了
+2. 语气要专业礼貌
+3. 直接给出回复内容，不需要添加"回复："等前缀
+4. 不需要包含发件人、收件人等邮件头信息"""
+
+_SUMMARY_PROMPT_HEAD = """请用一到两句话总结以下邮件的核心内容：
+
+邮件内容：
+"""
+
+_SUMMARY_PROMPT_TAIL = """
+
+要求：
+1. 摘要要简洁明了
+2. 突出重点信息
+3. 不超过100字"""
+
+_PRIORITY_PROMPT_HEAD = """请分析以下邮件的优先级和紧急程度，并以JSON格式返回结果：
+
+"""
+
+_PRIORITY_PROMPT_TAIL = """
+
+请返回以下信息（必须是有效的JSON格式）：
+{
+    "priority": "优先级（高/中/低）",
+    "urgency": "紧急程度（紧急/一般/不紧急）",
+    "is_important": true/false,
+    "reason": "判断理由",
+    "suggested_action": "建议的处理方式"
+}"""
+
+_SUBJECT_PROMPT_HEAD = """请根据以下内容提示生成一个合适的邮件主题：
+
+内容提示：
+"""
+
+_SUBJECT_PROMPT_TAIL = """
+
+要求：
+1. 主题要简洁明了，不超过10个字
+2. 能准确反映邮件内容
+3. 不需要添加"主题："等前缀
+4. 直接给出主题文本"""
+
+_CONTENT_PROMPT_HEAD = """请根据以下内容提示撰写一封完整的邮件：
+
+内容提示/要点：
+"""
+
+_CONTENT_PROMPT_TAIL = """
+
+要求：
+1. 邮件内容要完整、专业、得体
+2. 包含适当的问候语和结尾
+3. 语气要礼貌自然
+4. 直接给出邮件正文，不需要添加"邮件内容："等前缀"""
+
+
+# ==================== 系统消息 ====================
+# 各方法固定的系统消息，所有请求共享同一对象（约定为只读，不要修改）
+
+_ANALYZE_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "你是一个专业的邮件分析助手，擅长分析邮件内容并提取关键信息。",
+}
+
+_REPLY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "你是一个专业的邮件助手，擅长撰写得体的邮件回复。",
+}
+
+_SUMMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "你是一个专业的文本摘要助手。",
+}
+
+_PRIORITY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "你是一个专业的邮件优先级分析助手。",
+}
+
+_SUBJECT_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "你是一个专业的邮件助手，擅长撰写邮件主题。",
+}
+
+_CONTENT_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "你是一个专业的邮件撰写助手，擅长撰写各种类型的邮件。",
+}
+
+_CHAT_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "你是一个友好、专业的智能邮件助手。",
+}
+
 
 class DeepSeekAPI:
     """DeepSeek API 调用类"""
 
+    # 分析/摘要结果缓存的最大条目数
+    _RESULT_CACHE_SIZE = 1024
+
     def __init__(self):
         """初始化 DeepSeek API 客户端"""
         self.api_url = Config.DEEPSEEK_API_URL
@@ -22,6 +199,12 @@ class DeepSeekAPI:
         self.model = Config.DEEPSEEK_MODEL
         self.timeout = Config.API_TIMEOUT
         self.max_retries = Config.API_MAX_RETRIES
+        self.max_concurrency = Config.API_MAX_CONCURRENCY
+
+        # 按内容哈希缓存分析和摘要结果（LRU），相同邮件不再重复请求
+        # map_concurrently 会在多个线程中访问，需要加锁
+        self._result_cache: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
 
         # 设置请求头
         self.headers = {
@@ -29,6 +212,124 @@ class DeepSeekAPI:
             "Authorization": f"Bearer {self.api_key}",
         }
 
+        # 复用同一个会话，保持 TCP/TLS 连接，避免每次请求重新握手
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+
+        # 重试策略：对速率限制、网关错误和超时进行带抖动的指数退避重试，
+        # 并遵循服务器返回的 Retry-After 头
+        retry = Retry(
+            total=max(self.max_retries - 1, 0),
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            backoff_factor=1,
+            backoff_jitter=0.5,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # 会话只访问 API 一个主机：只保留一个连接池，
+        # 池大小与最大并发数一致，保证并发请求的连接都能放回池中复用
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(self.max_concurrency, 1),
+            max_retries=retry,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """关闭底层 HTTP 会话，释放连接"""
+        self._session.close()
+
+    def clear_cache(self) -> None:
+        """清空分析和摘要结果缓存"""
+        with self._result_cache_lock:
+            self._result_cache.clear()
+
+    def _cache_key(self, kind: str, content: str) -> bytes:
+        """
+        生成结果缓存的键
+
+        使用内容的 blake2b 摘要，避免以完整邮件正文作为键占用内存；
+        模型名称作为盐值，切换模型后旧结果自然失效
+
+        Args:
+            kind: 结果类型（如 analyze、summary）
+            content: 邮件内容
+
+        Returns:
+            bytes: 16 字节的摘要
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.model}\0{kind}\0".encode())
+        digest.update(content.encode("utf-8", "surrogatepass"))
+        return digest.digest()
+
+    def _cache_get(self, key: bytes) -> Optional[Any]:
+        """
+        读取缓存的结果
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[Any]: 缓存的结果，未命中返回 None
+        """
+        with self._result_cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                self._result_cache.move_to_end(key)
+        return cached
+
+    def _cache_put(self, key: bytes, value: Any) -> None:
+        """
+        写入结果缓存，超出容量时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            value: 要缓存的结果
+        """
+        with self._result_cache_lock:
+            self._result_cache[key] = value
+            self._result_cache.move_to_end(key)
+            if len(self._result_cache) > self._RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+    def __enter__(self) -> "DeepSeekAPI":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def map_concurrently(
+        self, func: Callable[[Any], Any], items: List[Any]
+    ) -> List[Any]:
+        """
+        并发地对多个输入调用 API 方法，请求共享同一会话的连接池
+
+        Args:
+            func: 对单个输入调用的方法，如 self.summarize_email_content
+            items: 输入列表
+
+        Returns:
+            List[Any]: 与 items 顺序一致的结果列表，
+                单个调用抛出的异常会作为对应位置的结果返回
+        """
+        workers = min(self.max_concurrency, len(items))
+        if workers <= 1:
+            results = []
+            for item in items:
+                try:
+                    results.append(func(item))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(func, item) for item in items]
+
+        return [future.exception() or future.result() for future in futures]
+
     def _make_request(
         self,
         messages: List[Dict[str, str]],
@@ -46,53 +347,47 @@ class DeepSeekAPI:
         Returns:
             Optional[str]: API 返回的文本内容，失败返回 None
         """
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
-
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.post(
-                    self.api_url,
-                    headers=self.headers,
-                    json=payload,
-                    timeout=self.timeout,
-                )
-
-                # 检查响应状态
-                if response.status_code == 200:
-                    result = response.json()
-                    return result["choices"][0]["message"]["content"].strip()
-                elif response.status_code == 429:
-                    # 速率限制，等待后重试
-                    wait_time = 2**attempt
-                    print(f"API 速率限制，等待 {wait_time} 秒后重试...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"API 请求失败，状态码: {response.status_code}")
-                    print(f"错误信息: {response.text}")
-                    return None
-
-            except requests.exceptions.Timeout:
-                print(f"API 请求超时 (尝试 {attempt + 1}/{self.max_retries})")
-                if attempt < self.max_retries - 1:
-                    time.sleep(2**attempt)
-                    continue
-                return None
-
-            except requests.exceptions.RequestException as e:
-                print(f"API 请求异常: {str(e)}")
-                return None
-
-            except (KeyError, json.JSONDecodeError) as e:
-                print(f"解析 API 响应失败: {str(e)}")
-                return None
+        # 请求体只序列化一次，重试时直接复用同一份字节
+        body = _json_dumps(
+            {
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            }
+        )
 
-        return None
+        # 速率限制、网关错误和超时由会话上挂载的 Retry 策略自动重试
+        try:
+            response = self._session.post(
+                self.api_url,
+                data=body,
+                timeout=self.timeout,
+            )
+
+            # 检查响应状态
+            if response.status_code == 200:
+                result = _json_loads(response.content)
+                return result["choices"][0]["message"]["content"].strip()
+
+            _log.error(
+                "API 请求失败，状态码: %s，错误信息: %s",
+                response.status_code,
+                response.text,
+            )
+            return None
+
+        except requests.exceptions.Timeout:
+            _log.error("API 请求超时")
+            return None
+
+        except requests.exceptions.RequestException as e:
+            _log.error("API 请求异常: %s", e)
+            return None
+
+        except (KeyError, json.JSONDecodeError) as e:
+            _log.error("解析 API 响应失败: %s", e)
+            return None
 
     def analyze_email_content(self, email_content: str) -> Dict[str, Any]:
         """
@@ -104,25 +399,16 @@ class DeepSeekAPI:
         Returns:
             Dict[str, Any]: 包含分类、情感、主题等分析结果
         """
-        prompt = f"""请分析以下邮件内容，并以JSON格式返回分析结果：
-
-邮件内容：
-{email_content}
+        cache_key = self._cache_key("analyze", email_content)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            # 返回副本，调用方可能会修改结果字典
+            return copy.deepcopy(cached)
 
-请返回以下信息（必须是有效的JSON格式）：
-{{
-    "category": "邮件分类（工作/个人/营销/通知/其他）",
-    "sentiment": "情感倾向（积极/中性/消极）",
-    "urgency": "紧急程度（高/中/低）",
-    "topics": ["主题1", "主题2"],
-    "summary": "简短摘要（一句话）"
-}}"""
+        prompt = _ANALYZE_PROMPT_HEAD + email_content + _ANALYZE_PROMPT_TAIL
 
         messages = [
-            {
-                "role": "system",
-                "content": "你是一个专业的邮件分析助手，擅长分析邮件内容并提取关键信息。",
-            },
+            _ANALYZE_SYSTEM_MESSAGE,
             {"role": "user", "content": prompt},
         ]
 
@@ -130,20 +416,15 @@ class DeepSeekAPI:
 
         if response:
             try:
-                # 尝试提取JSON内容
-                # 有时模型会在JSON前后添加说明文字，需要提取纯JSON部分
-                start_idx = response.find("{")
-                end_idx = response.rfind("}") + 1
-                if start_idx != -1 and end_idx > start_idx:
-                    json_str = response[start_idx:end_idx]
-                    result = json.loads(json_str)
+                result = _extract_json(response)
+                if result is not None:
+                    self._cache_put(cache_key, copy.deepcopy(result))
                     return result
                 else:
-                    print("响应中未找到有效的JSON格式")
+                    _log.warning("响应中未找到有效的JSON格式")
                     return self._get_default_analysis()
             except json.JSONDecodeError as e:
-                print(f"解析邮件分析结果失败: {str(e)}")
-                print(f"原始响应: {response}")
+                _log.warning("解析邮件分析结果失败: %s，原始响应: %s", e, response)
                 return self._get_default_analysis()
 
         return self._get_default_analysis()
@@ -159,24 +440,19 @@ class DeepSeekAPI:
         Returns:
             str: 生成的回复内容
         """
-        prompt = f"""请根据以下邮件内容生成一封专业、礼貌的回复邮件：
-
-原始邮件：
-{email_content}
-
-{f"额外信息：{context}" if context else ""}
-
-要求：
-1. 回复要简洁明了
-2. 语气要专业礼貌
-3. 直接给出回复内容，不需要添加"回复："等前缀
-4. 不需要包含发件人、收件人等邮件头信息"""
+        context_line = "额外信息：" + context if context else ""
+        prompt = "".join(
+            (
+                _REPLY_PROMPT_HEAD,
+                email_content,
+                "\n\n",
+                context_line,
+                _REPLY_PROMPT_TAIL,
+            )
+        )
 
         messages = [
-            {
-                "role": "system",
-                "content": "你是一个专业的邮件助手，擅长撰写得体的邮件回复。",
-            },
+            _REPLY_SYSTEM_MESSAGE,
             {"role": "user", "content": prompt},
         ]
 
@@ -198,18 +474,15 @@ class DeepSeekAPI:
         Returns:
             str: 邮件摘要
         """
-        prompt = f"""请用一到两句话总结以下邮件的核心内容：
+        cache_key = self._cache_key("summary", email_content)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
 
-邮件内容：
-{email_content}
-
-要求：
-1. 摘要要简洁明了
-2. 突出重点信息
-3. 不超过100字"""
+        prompt = _SUMMARY_PROMPT_HEAD + email_content + _SUMMARY_PROMPT_TAIL
 
         messages = [
-            {"role": "system", "content": "你是一个专业的文本摘要助手。"},
+            _SUMMARY_SYSTEM_MESSAGE,
             {"role": "user", "content": prompt},
         ]
 
@@ -217,7 +490,12 @@ class DeepSeekAPI:
             messages, temperature=0.3, max_tokens=Config.SUMMARY_MAX_TOKENS
         )
 
-        return response if response else "无法生成摘要"
+        if not response:
+            return "无法生成摘要"
+
+        # 只缓存成功的结果，失败时下次仍会重新请求
+        self._cache_put(cache_key, response)
+        return response
 
     def analyze_priority(self, email_content: str, sender: str = "") -> Dict[str, Any]:
         """
@@ -230,23 +508,19 @@ class DeepSeekAPI:
         Returns:
             Dict[str, Any]: 包含优先级、紧急程度、原因等信息
         """
-        prompt = f"""请分析以下邮件的优先级和紧急程度，并以JSON格式返回结果：
-
-{f"发件人：{sender}" if sender else ""}
-邮件内容：
-{email_content}
-
-请返回以下信息（必须是有效的JSON格式）：
-{{
-    "priority": "优先级（高/中/低）",
-    "urgency": "紧急程度（紧急/一般/不紧急）",
-    "is_important": true/false,
-    "reason": "判断理由",
-    "suggested_action": "建议的处理方式"
-}}"""
+        sender_line = "发件人：" + sender if sender else ""
+        prompt = "".join(
+            (
+                _PRIORITY_PROMPT_HEAD,
+                sender_line,
+                "\n邮件内容：\n",
+                email_content,
+                _PRIORITY_PROMPT_TAIL,
+            )
+        )
 
         messages = [
-            {"role": "system", "content": "你是一个专业的邮件优先级分析助手。"},
+            _PRIORITY_SYSTEM_MESSAGE,
             {"role": "user", "content": prompt},
         ]
 
@@ -254,22 +528,13 @@ class DeepSeekAPI:
 
         if response:
             try:
-                start_idx = response.find("{")
-                end_idx = response.rfind("}") + 1
-                if start_idx != -1 and end_idx > start_idx:
-                    json_str = response[start_idx:end_idx]
-                    result = json.loads(json_str)
+                result = _extract_json(response)
+                if result is not None:
                     return result
             except json.JSONDecodeError as e:
-                print(f"解析优先级分析结果失败: {str(e)}")
+                _log.warning("解析优先级分析结果失败: %s", e)
 
-        return {
-            "priority": "中",
-            "urgency": "一般",
-            "is_important": False,
-            "reason": "无法分析",
-            "suggested_action": "正常处理",
-        }
+        return self._get_default_priority()
 
     def generate_email_subject(self, content_prompt: str) -> str:
         """
@@ -281,22 +546,10 @@ class DeepSeekAPI:
         Returns:
             str: 生成的邮件主题
         """
-        prompt = f"""请根据以下内容提示生成一个合适的邮件主题：
-
-内容提示：
-{content_prompt}
-
-要求：
-1. 主题要简洁明了，不超过10个字
-2. 能准确反映邮件内容
-3. 不需要添加"主题："等前缀
-4. 直接给出主题文本"""
+        prompt = _SUBJECT_PROMPT_HEAD + content_prompt + _SUBJECT_PROMPT_TAIL
 
         messages = [
-            {
-                "role": "system",
-                "content": "你是一个专业的邮件助手，擅长撰写邮件主题。"
-            },
+            _SUBJECT_SYSTEM_MESSAGE,
             {"role": "user", "content": prompt},
         ]
 
@@ -313,22 +566,10 @@ class DeepSeekAPI:
         Returns:
             str: 生成的邮件内容
         """
-        prompt = f"""请根据以下内容提示撰写一封完整的邮件：
-
-内容提示/要点：
-{content_prompt}
-
-要求：
-1. 邮件内容要完整、专业、得体
-2. 包含适当的问候语和结尾
-3. 语气要礼貌自然
-4. 直接给出邮件正文，不需要添加"邮件内容："等前缀"""
+        prompt = _CONTENT_PROMPT_HEAD + content_prompt + _CONTENT_PROMPT_TAIL
 
         messages = [
-            {
-                "role": "system",
-                "content": "你是一个专业的邮件撰写助手，擅长撰写各种类型的邮件。"
-            },
+            _CONTENT_SYSTEM_MESSAGE,
             {"role": "user", "content": prompt},
         ]
 
@@ -354,6 +595,21 @@ class DeepSeekAPI:
             "summary": "无法分析邮件内容",
         }
 
+    def _get_default_priority(self) -> Dict[str, Any]:
+        """
+        返回默认的优先级分析结果
+
+        Returns:
+            Dict[str, Any]: 默认优先级分析结果
+        """
+        return {
+            "priority": "中",
+            "urgency": "一般",
+            "is_important": False,
+            "reason": "无法分析",
+            "suggested_action": "正常处理",
+        }
+
     def chat(self, user_message: str, system_prompt: str = None) -> str:
         """
         通用聊天接口，用于生成自然语言回复
@@ -365,24 +621,13 @@ class DeepSeekAPI:
         Returns:
             str: AI 生成的回复
         """
-        messages = []
-        
-        if system_prompt:
-            messages.append({
-                "role": "system",
-                "content": system_prompt
-            })
-        else:
-            messages.append({
-                "role": "system",
-                "content": "你是一个友好、专业的智能邮件助手。"
-            })
-        
-        messages.append({
-            "role": "user",
-            "content": user_message
-        })
-        
+        system_message = (
+            {"role": "system", "content": system_prompt}
+            if system_prompt
+            else _CHAT_SYSTEM_MESSAGE
+        )
+        messages = [system_message, {"role": "user", "content": user_message}]
+
         response = self._make_request(
             messages,
             temperature=0.7,
@@ -392,8 +637,15 @@ class DeepSeekAPI:
         return response if response else "抱歉，我现在无法回复。请稍后再试。"
 
 
-# 创建全局 API 实例
-deepseek_api = DeepSeekAPI()
+@functools.cache
+def get_api() -> DeepSeekAPI:
+    """
+    获取全局 API 实例（首次调用时创建）
+
+    Returns:
+        DeepSeekAPI: 全局共享的 API 客户端
+    """
+    return DeepSeekAPI()
 
 
 # ==================== 便捷函数 ====================
@@ -409,7 +661,7 @@ def analyze_email_content(email_content: str) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: 分析结果
     """
-    return deepseek_api.analyze_email_content(email_content)
+    return get_api().analyze_email_content(email_content)
 
 
 def generate_reply(email_content: str, context: str = "") -> str:
@@ -423,7 +675,7 @@ def generate_reply(email_content: str, context: str = "") -> str:
     Returns:
         str: 生成的回复
     """
-    return deepseek_api.generate_reply(email_content, context)
+    return get_api().generate_reply(email_content, context)
 
 
 def summarize_email_content(email_content: str) -> str:
@@ -436,7 +688,7 @@ def summarize_email_content(email_content: str) -> str:
     Returns:
         str: 邮件摘要
     """
-    return deepseek_api.summarize_email_content(email_content)
+    return get_api().summarize_email_content(email_content)
 
 
 def analyze_priority(email_content: str, sender: str = "") -> Dict[str, Any]:
@@ -450,7 +702,7 @@ def analyze_priority(email_content: str, sender: str = "") -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: 优先级分析结果
     """
-    return deepseek_api.analyze_priority(email_content, sender)
+    return get_api().analyze_priority(email_content, sender)
 
 
 def generate_email_subject(content_prompt: str) -> str:
@@ -463,7 +715,7 @@ def generate_email_subject(content_prompt: str) -> str:
     Returns:
         str: 生成的邮件主题
     """
-    return deepseek_api.generate_email_subject(content_prompt)
+    return get_api().generate_email_subject(content_prompt)
 
 
 def generate_email_content(content_prompt: str) -> str:
@@ -476,7 +728,7 @@ def generate_email_content(content_prompt: str) -> str:
     Returns:
         str: 生成的邮件内容
     """
-    return deepseek_api.generate_email_content(content_prompt)
+    return get_api().generate_email_content(content_prompt)
 
 
 if __name__ == "__main__":
@@ -4,26 +4,414 @@
 使用 IMAP 协议读取邮件，使用 SMTP 协议发送邮件
 """
 
+import codecs
 import email
+import functools
 import imaplib
+import logging
+import random
 import re
 import smtplib
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from email import policy
+from email.generator import BytesGenerator
 from email.header import decode_header
 from email.message import Message
-from email.mime.multipart import MIMEMultipart
+from email.parser import BytesHeaderParser
 from email.mime.text import MIMEText
 from email.utils import parseaddr
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from config import Config
 
+_log = logging.getLogger(__name__)
+
 # 添加 IMAP ID 命令支持（163邮箱等需要）
 imaplib.Commands["ID"] = ("AUTH",)
 
+# HTML 正文清理用的正则（预编译，所有邮件复用）
+# script/style 块和注释（含 Outlook 的 <!--[if mso]> 条件注释）不是正文，整体删除，
+# 避免把脚本和样式送给大模型；注释中的 ">" 也不会再截断标签匹配
+_HTML_SCRIPT_STYLE_RE = re.compile(
+    r"<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+# 判断 SELECT 异常是否为连接错误（WinError 10054 等）的关键词
+_CONNECTION_ERROR_RE = re.compile(
+    r"10054|连接|connection|abort|socket|broken|reset|eof", re.IGNORECASE
+)
+
+# FETCH 响应中的 FLAGS 列表，如 FLAGS (\Seen \Flagged)
+_FLAGS_RE = re.compile(rb"FLAGS \(([^)]*)\)")
+
+# SMTP DATA 中以 "." 开头的行需要再加一个 "."（dot-stuffing）
+_SMTP_LEADING_DOT_RE = re.compile(rb"(?m)^\.")
+
+# LIST 响应行，如 (\HasNoChildren) "/" "Sent Messages" 或 (\HasNoChildren) "." INBOX
+# 分组 1 为带引号的文件夹名（保留转义原样），分组 2 为不带引号的文件夹名
+_LIST_RE = re.compile(
+    rb'\([^)]*\)\s+(?:"(?:[^"\\]|\\.)*"|NIL)\s+(?:"((?:[^"\\]|\\.)*)"|([^\s"]+))',
+    re.IGNORECASE,
+)
+
+
+def _html_to_text(html_body: str) -> str:
+    """
+    简单地将 HTML 正文转换为纯文本
+
+    Args:
+        html_body: HTML 内容
+
+    Returns:
+        str: 去除标签、脚本和样式后的文本
+    """
+    return _HTML_TAG_RE.sub("", _HTML_SCRIPT_STYLE_RE.sub("", html_body))
+
+
+# 轻量级模式只需要头部，解析到空行即停止，不构建正文的 MIME 结构
+_HEADER_PARSER = BytesHeaderParser()
+
+
+def _message_sets(email_ids: List[str], max_length: int = 4000) -> List[str]:
+    """
+    将邮件 ID 拼接为 IMAP 序列集合（如 1,3,5），过长时拆分为多段，
+    避免部分服务器（如 Cyrus）拒绝超长的命令参数
+
+    Args:
+        email_ids: 邮件 ID 列表
+        max_length: 每段序列集合的最大长度
+
+    Returns:
+        List[str]: 序列集合列表
+    """
+    message_sets = []
+    current: List[str] = []
+    length = 0
+    for email_id in email_ids:
+        if current and length + len(email_id) + 1 > max_length:
+            message_sets.append(",".join(current))
+            current, length = [], 0
+        current.append(email_id)
+        length += len(email_id) + 1
+    if current:
+        message_sets.append(",".join(current))
+    return message_sets
+
+
+# TCP 保活参数：闲置 60 秒后开始探测，每 30 秒一次，连续 3 次无响应判定断开
+# 保持 NAT 映射不过期，防火墙静默断开的连接也能被及时发现
+_TCP_KEEPALIVE_OPTIONS = (
+    ("TCP_KEEPIDLE", 60),
+    ("TCP_KEEPINTVL", 30),
+    ("TCP_KEEPCNT", 3),
+)
+
+
+def _tune_socket(sock: Optional[socket.socket]) -> None:
+    """
+    调整连接底层套接字：关闭 Nagle 算法，避免 STORE/EXPUNGE 等小命令在等待 ACK 时
+    被延迟发送；开启 TCP 保活，长时间复用的连接不会因 NAT/服务器闲置超时被悄悄断开
+
+    Args:
+        sock: 连接底层的套接字（SSLSocket 同样适用）
+    """
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # 保活参数的常量并非所有平台都有（如 macOS 没有 TCP_KEEPIDLE）
+        for name, value in _TCP_KEEPALIVE_OPTIONS:
+            option = getattr(socket, name, None)
+            if option is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, option, value)
+    except OSError:
+        # 部分平台或套接字类型不支持，保持默认设置
+        pass
+
+
+# 字符集名称 -> CodecInfo；无法识别的名称缓存为 UTF-8，避免每次解码都重新查找
+# 字符集名称来自外部邮件，限制缓存条目数，防止被随意构造的名称撑大
+_CODECS: Dict[Optional[str], codecs.CodecInfo] = {}
+_CODECS_MAX = 256
+
+
+def _get_codec(name: Optional[str]) -> codecs.CodecInfo:
+    """
+    查找并缓存字符集对应的编解码器
+
+    Args:
+        name: 字符集名称，缺省或无法识别时按 UTF-8 处理
+
+    Returns:
+        codecs.CodecInfo: 编解码器信息
+    """
+    codec = _CODECS.get(name)
+    if codec is None:
+        try:
+            codec = codecs.lookup(name or "utf-8")
+        except LookupError:
+            codec = codecs.lookup("utf-8")
+        if len(_CODECS) < _CODECS_MAX:
+            _CODECS[name] = codec
+    return codec
+
+
+def _decode_payload(payload: bytes, charset: Optional[str]) -> str:
+    """
+    按 MIME 头部声明的字符集解码正文
+
+    errors="ignore" 下解码不会抛出 UnicodeDecodeError，无法识别的字符集由 _get_codec 回退到 UTF-8
+
+    Args:
+        payload: 正文字节串
+        charset: Content-Type 中声明的字符集，缺省按 UTF-8 处理
+
+    Returns:
+        str: 解码后的正文
+    """
+    return _get_codec(charset).decode(payload, "ignore")[0]
+
+
+def _decode_header_parts(value: Any) -> str:
+    """
+    使用 decode_header 解码头部并拼接各部分
+
+    Args:
+        value: 头部值（str 或 Header 对象）
+
+    Returns:
+        str: 解码后的字符串
+    """
+    decoded_parts = decode_header(value)
+    result = []
+
+    for part, encoding in decoded_parts:
+        if isinstance(part, bytes):
+            result.append(_decode_payload(part, encoding))
+        else:
+            result.append(str(part))
+
+    return "".join(result)
+
+
+@functools.lru_cache(maxsize=2048)
+def _decode_encoded_header(value: str) -> str:
+    """
+    带 LRU 缓存的编码头部解码（仅接受可哈希的 str）
+
+    Args:
+        value: 包含编码字的头部值
+
+    Returns:
+        str: 解码后的字符串
+    """
+    return _decode_header_parts(value)
+
+
+def _imap_locked(method):
+    """
+    装饰器：持有 IMAP 锁执行方法，调用成功时记录连接活动时间
+
+    imaplib 连接不是线程安全的，后台保活线程和调用方的命令不能交错发送
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._imap_lock:
+            result = method(self, *args, **kwargs)
+            if result:
+                # 调用成功说明连接可用
+                self._last_activity = time.monotonic()
+            return result
+
+    return wrapper
+
+
+def _smtp_locked(method):
+    """装饰器：持有 SMTP 锁执行方法，避免多个线程在同一 SMTP 连接上交错发送"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._smtp_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _batch_summary(results: List[Dict[str, str]], ok_status: str) -> Dict[str, Any]:
+    """
+    汇总批量操作的结果
+
+    Args:
+        results: 每一项的结果（含 status 字段），顺序与输入一致
+        ok_status: 表示成功的 status 值
+
+    Returns:
+        Dict[str, Any]: 包含成功和失败信息的字典
+    """
+    success_count = sum(1 for result in results if result["status"] == ok_status)
+    return {
+        "total": len(results),
+        "success": success_count,
+        "failed": len(results) - success_count,
+        "results": results,
+    }
+
+
+def _pipelined_sendmail(
+    conn: smtplib.SMTP, from_addr: str, to_addrs: List[str], msg: bytes
+) -> Dict[str, Tuple[int, bytes]]:
+    """
+    使用 SMTP PIPELINING 扩展（RFC 2920）发送邮件：MAIL FROM、RCPT TO 和 DATA
+    一次写出，再依次读取各自的响应，比 sendmail 逐条等待少 1 + 收件人数 次往返
+
+    服务器不支持 PIPELINING 时退回 sendmail，返回值和异常与 sendmail 一致
+
+    Args:
+        conn: 已登录的 SMTP 连接
+        from_addr: 发件人地址
+        to_addrs: 收件人列表
+        msg: 已按 CRLF 换行的邮件内容
+
+    Returns:
+        Dict[str, Tuple[int, bytes]]: 被拒绝的收件人及服务器响应
+    """
+    conn.ehlo_or_helo_if_needed()
+    if not conn.has_extn("pipelining"):
+        return conn.sendmail(from_addr, to_addrs, msg)
+
+    options = " SIZE=%d" % len(msg) if conn.has_extn("size") else ""
+    commands = ["mail FROM:%s%s\r\n" % (smtplib.quoteaddr(from_addr), options)]
+    commands += ["rcpt TO:%s\r\n" % smtplib.quoteaddr(addr) for addr in to_addrs]
+    commands.append("data\r\n")
+    conn.send("".join(commands))
+
+    replies = [conn.getreply() for _ in commands]
+    if any(code == 421 for code, _ in replies):
+        conn.close()
+        raise smtplib.SMTPServerDisconnected("服务器关闭了连接 (421)")
+
+    mail_code, mail_resp = replies[0]
+    refused = {
+        addr: reply
+        for addr, reply in zip(to_addrs, replies[1:-1])
+        if reply[0] not in (250, 251)
+    }
+    code, resp = replies[-1]
+
+    accepted = mail_code == 250 and len(refused) < len(to_addrs)
+    if code == 354:
+        if accepted:
+            data = _SMTP_LEADING_DOT_RE.sub(b"..", msg)
+            if not data.endswith(b"\r\n"):
+                data += b"\r\n"
+            conn.send(data + b".\r\n")
+        else:
+            # 信封已被拒绝但服务器仍进入了 DATA，发送空内容结束本次事务
+            conn.send(b".\r\n")
+        code, resp = conn.getreply()
+
+    if mail_code != 250:
+        conn.rset()
+        raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+    if not accepted:
+        conn.rset()
+        raise smtplib.SMTPRecipientsRefused(refused)
+    if code != 250:
+        conn.rset()
+        raise smtplib.SMTPDataError(code, resp)
+    return refused
+
+
+def _smtp_alive(conn: smtplib.SMTP) -> bool:
+    """用 NOOP 检查 SMTP 连接是否仍然可用"""
+    try:
+        return conn.noop()[0] == 250
+    except Exception:
+        return False
+
+
+class _SMTPConnectionPool:
+    """
+    SMTP 连接池：批量发送时各工作线程取用已登录的连接，用完放回供后续发送复用，
+    避免每封邮件都重新建立 TCP + TLS + 登录
+    """
+
+    def __init__(self, connect: Callable[[], smtplib.SMTP]):
+        """
+        Args:
+            connect: 创建并登录新 SMTP 连接的函数
+        """
+        self._connect = connect
+        # 空闲连接及其放回池中的时间
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> smtplib.SMTP:
+        """取出一个空闲连接（闲置过久的先用 NOOP 确认仍可用），没有时新建"""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, released_at = self._idle.pop()
+            if time.monotonic() - released_at < EmailClient._SMTP_IDLE_CHECK_SECONDS:
+                return conn
+            if _smtp_alive(conn):
+                return conn
+            self.discard(conn)
+        return self._connect()
+
+    def release(self, conn: smtplib.SMTP) -> None:
+        """将连接放回池中"""
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+
+    @staticmethod
+    def discard(conn: smtplib.SMTP) -> None:
+        """丢弃已失效的连接"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """关闭池中所有连接"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            try:
+                conn.quit()
+            except Exception:
+                self.discard(conn)
+
 
 class EmailClient:
     """邮件客户端类"""
 
+    # 距上次成功命令不足该秒数时，跳过 NOOP 连接检查
+    _NOOP_SKIP_SECONDS = 60
+
+    # 邮件列表缓存有效期（秒），界面来回切换时直接复用最近的列表
+    _LISTING_CACHE_TTL = 30
+
+    # 最近获取的完整邮件缓存：条目上限与有效期（秒）
+    # 邮件 ID 为序号，其他客户端删除邮件后可能错位，因此只短时间缓存
+    _EMAIL_CACHE_SIZE = 256
+    _EMAIL_CACHE_TTL = 60
+
+    # 批量转发的最大并发数（每个线程使用各自的 SMTP 连接）
+    _FORWARD_MAX_WORKERS = 8
+
+    # SMTP 连接闲置超过该秒数后，复用前先发送 NOOP 确认连接仍然可用
+    _SMTP_IDLE_CHECK_SECONDS = 60
+
     def __init__(self, 
                  email_account: Optional[str] = None, 
                  email_password: Optional[str] = None,
@@ -42,10 +430,113 @@ class EmailClient:
         self.imap_connection = None
         self.smtp_connection = None
 
-    def connect_imap(self) -> bool:
+        # 最近一次使用 SMTP 连接的时间（time.monotonic()）
+        self._smtp_last_use = 0.0
+
+        # SMTP 锁（可重入，发送方法内部会连接/断开），服务端多线程处理请求时共享同一连接
+        self._smtp_lock = threading.RLock()
+
+        # 文件夹缓存（每个 IMAP 连接内有效，断开或重连时清空）
+        # _folder_cache: 文件夹类型 -> 实际文件夹名称（None 表示未找到）
+        # _folders_listing: LIST 命令返回的文件夹列表
+        self._folder_cache: Dict[str, Optional[str]] = {}
+        self._folders_listing: Optional[List[str]] = None
+
+        # 当前以读写模式选中的文件夹，相同文件夹不再重复 SELECT
+        self._current_folder: Optional[str] = None
+
+        # IMAP 锁（可重入，公共方法之间会互相调用）和后台保活定时器
+        self._imap_lock = threading.RLock()
+        self._keepalive_timer: Optional[threading.Timer] = None
+
+        # 最近一次确认连接可用的时间（time.monotonic()），0 表示未知
+        self._last_activity = 0.0
+
+        # 闲置连接池：已选中的文件夹 -> (连接, 最近活动时间)，按最近使用排序
+        # 活动连接始终是 imap_connection，切换文件夹时与池中连接交换
+        self._imap_pool: "OrderedDict[str, Tuple[imaplib.IMAP4, float]]" = OrderedDict()
+
+        # 邮件列表缓存：(folder, count, days) -> (缓存时间, 邮件列表)
+        # 删除、归档、标记等写操作会使其失效
+        self._listing_cache: Dict[
+            Tuple[str, int, int], Tuple[float, List[Dict[str, Any]]]
+        ] = {}
+
+        # 完整邮件缓存（LRU）：(folder, email_id) -> (缓存时间, 邮件信息)
+        # 不含 raw_message，写操作同样使其失效
+        self._email_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def _start_keepalive(self, delay: Optional[float] = None) -> None:
+        """
+        启动（或重新安排）后台 NOOP 保活定时器
+
+        Args:
+            delay: 距下次检查的秒数，默认为配置的保活间隔
+        """
+        self._stop_keepalive()
+        interval = Config.IMAP_KEEPALIVE_INTERVAL
+        if interval <= 0:
+            return
+
+        timer = threading.Timer(interval if delay is None else delay, self._keepalive)
+        timer.daemon = True
+        self._keepalive_timer = timer
+        timer.start()
+
+    def _stop_keepalive(self) -> None:
+        """取消后台保活定时器"""
+        if self._keepalive_timer:
+            self._keepalive_timer.cancel()
+            self._keepalive_timer = None
+
+    def _keepalive(self) -> None:
+        """
+        后台定时发送 NOOP，在服务器或 NAT 超时前保持连接活跃，
+        避免用户操作时才发现连接已断开而需要重新登录
+        """
+        with self._imap_lock:
+            # 定时器已被取消或替换（如期间发生了重连），不再处理
+            if self._keepalive_timer is not threading.current_thread():
+                return
+            if not self.imap_connection:
+                self._keepalive_timer = None
+                return
+
+            # 期间有过其他命令，连接本身就是活跃的，推迟到空闲满一个间隔再发送
+            idle = time.monotonic() - self._last_activity
+            interval = Config.IMAP_KEEPALIVE_INTERVAL
+            if idle < interval:
+                self._start_keepalive(interval - idle)
+                return
+
+            try:
+                status, _ = self.imap_connection.noop()
+            except Exception as e:
+                _log.warning("IMAP 保活失败，连接已失效: %s", e)
+                status = None
+
+            if status == "OK":
+                self._last_activity = time.monotonic()
+                self._start_keepalive()
+            else:
+                # 连接失效，关闭后丢弃，下次调用时由 _ensure_imap_connection 重连；
+                # 服务器仍有响应（NOOP 被拒绝）时先登出
+                self._discard_imap_connection(logout=status is not None)
+                self._keepalive_timer = None
+
+    def _clear_folder_cache(self) -> None:
+        """清空文件夹缓存"""
+        self._folder_cache.clear()
+        self._folders_listing = None
+
+    @_imap_locked
+    def connect_imap(self, keep_folder_cache: bool = False) -> bool:
         """
         连接到 IMAP 服务器
 
+        Args:
+            keep_folder_cache: 是否保留文件夹缓存（为连接池新增连接时，同一账户的文件夹不会变化）
+
         Returns:
             bool: 连接是否成功
         """
@@ -56,9 +547,15 @@ class EmailClient:
                 )
             else:
                 self.imap_connection = imaplib.IMAP4(self.imap_server, self.imap_port)
+            _tune_socket(self.imap_connection.sock)
 
             # 登录
             self.imap_connection.login(self.email_account, self.email_password)
+
+            # 新连接上文件夹可能已变化，清空旧缓存
+            if not keep_folder_cache:
+                self._clear_folder_cache()
+            self._current_folder = None
             
             # 发送 IMAP ID 信息（163邮箱等需要）
             try:
@@ -77,6 +574,7 @@ class EmailClient:
                 print(f"→ IMAP ID 命令发送失败（部分服务器不支持）: {str(e)}")
             
             print(f"✓ 成功连接到 IMAP 服务器: {self.imap_server}")
+            self._start_keepalive()
             return True
 
         except imaplib.IMAP4.error as e:
@@ -86,8 +584,16 @@ class EmailClient:
             print(f"✗ IMAP 连接异常: {str(e)}")
             return False
 
+    @_imap_locked
     def disconnect_imap(self) -> None:
-        """断开 IMAP 连接"""
+        """断开 IMAP 连接（包括连接池中的闲置连接）"""
+        self._stop_keepalive()
+        while self._imap_pool:
+            _, (conn, _) = self._imap_pool.popitem()
+            try:
+                conn.logout()
+            except Exception:
+                pass
         if self.imap_connection:
             try:
                 self.imap_connection.logout()
@@ -95,21 +601,66 @@ class EmailClient:
             except Exception:
                 pass
             self.imap_connection = None
+        self._clear_folder_cache()
+        self._current_folder = None
+        self._last_activity = 0.0
     
     def _check_imap_connection(self) -> bool:
         """检查 IMAP 连接是否有效"""
         if not self.imap_connection:
             return False
+
+        # 最近刚成功执行过命令，连接必然可用，省去一次 NOOP 往返
+        if time.monotonic() - self._last_activity < self._NOOP_SKIP_SECONDS:
+            return True
         
         try:
             # 使用 NOOP 命令检查连接状态
             status, _ = self.imap_connection.noop()
-            return status == "OK"
+            if status == "OK":
+                self._last_activity = time.monotonic()
+                return True
+            # 服务器拒绝 NOOP 但连接仍在，登出后丢弃，避免重连时泄漏套接字
+            print(f"→ IMAP 连接不可用: {status}")
+            self._discard_imap_connection(logout=True)
+            return False
         except Exception as e:
             print(f"→ IMAP 连接已失效: {str(e)}")
-            self.imap_connection = None
+            self._discard_imap_connection(logout=False)
             return False
+
+    def _discard_imap_connection(self, logout: bool) -> None:
+        """
+        丢弃当前 IMAP 连接及其选中状态，并关闭底层套接字
+
+        Args:
+            logout: 连接仍可通信时发送 LOGOUT；已中断时直接关闭套接字，不再等待网络
+        """
+        conn = self.imap_connection
+        self.imap_connection = None
+        self._current_folder = None
+        self._last_activity = 0.0
+        if conn is None:
+            return
+        try:
+            if logout:
+                conn.logout()
+            else:
+                conn.shutdown()
+        except Exception:
+            pass
     
+    def _handle_imap_error(self, error: Exception) -> None:
+        """
+        IMAP 命令异常后的处理：连接已中断（abort / 网络错误）时丢弃该连接和选中状态，
+        下次调用时重新连接，而不是继续在失效的连接上跳过 SELECT 和 NOOP 检查
+
+        Args:
+            error: 捕获到的异常
+        """
+        if isinstance(error, (imaplib.IMAP4.abort, OSError)):
+            self._discard_imap_connection(logout=False)
+
     def _ensure_imap_connection(self) -> bool:
         """确保 IMAP 连接有效，如果无效则重连"""
         if self._check_imap_connection():
@@ -118,10 +669,14 @@ class EmailClient:
         print("→ IMAP 连接已断开，尝试重新连接...")
         return self.connect_imap()
     
+    @_imap_locked
     def list_folders(self) -> List[str]:
-        """列出所有可用的邮件文件夹"""
+        """列出所有可用的邮件文件夹（同一连接内只执行一次 LIST 命令）"""
         if not self._ensure_imap_connection():
             return []
+
+        if self._folders_listing is not None:
+            return list(self._folders_listing)
         
         try:
             status, folders = self.imap_connection.list()
@@ -130,19 +685,29 @@ class EmailClient:
             
             folder_list = []
             for folder_data in folders:
-                if folder_data:
-                    folder_str = folder_data.decode() if isinstance(folder_data, bytes) else str(folder_data)
-                    # 提取文件夹名称（格式通常是: (\HasNoChildren) "." "FolderName"）
-                    parts = folder_str.split('"')
-                    if len(parts) >= 3:
-                        folder_name = parts[-2]
-                        folder_list.append(folder_name)
+                if not folder_data:
+                    continue
+                if isinstance(folder_data, tuple):
+                    # 文件夹名以字面量（{n}）返回时，名称在元组的第二项
+                    folder_list.append(folder_data[1].decode(errors="replace"))
+                    continue
+
+                # 提取文件夹名称，名称保持服务器返回的修改版 UTF-7 原样，供 SELECT 使用
+                match = _LIST_RE.match(folder_data)
+                if match:
+                    folder_name = match.group(1)
+                    if folder_name is None:
+                        folder_name = match.group(2)
+                    folder_list.append(folder_name.decode(errors="replace"))
             
-            return folder_list
+            self._folders_listing = folder_list
+            return list(folder_list)
         except Exception as e:
             print(f"✗ 列出文件夹失败: {str(e)}")
+            self._handle_imap_error(e)
             return []
 
+    @_smtp_locked
     def connect_smtp(self) -> bool:
         """
         连接到 SMTP 服务器
@@ -151,17 +716,8 @@ class EmailClient:
             bool: 连接是否成功
         """
         try:
-            if Config.SMTP_USE_SSL:
-                self.smtp_connection = smtplib.SMTP_SSL(
-                    self.smtp_server, self.smtp_port
-                )
-            else:
-                self.smtp_connection = smtplib.SMTP(self.smtp_server, self.smtp_port)
-                if Config.SMTP_USE_TLS:
-                    self.smtp_connection.starttls()
-
-            # 登录
-            self.smtp_connection.login(self.email_account, self.email_password)
+            self.smtp_connection = self._open_smtp_connection()
+            self._smtp_last_use = time.monotonic()
             print(f"✓ 成功连接到 SMTP 服务器: {self.smtp_server}")
             return True
 
@@ -172,6 +728,64 @@ class EmailClient:
             print(f"✗ SMTP 连接异常: {str(e)}")
             return False
 
+    def _open_smtp_connection(self) -> smtplib.SMTP:
+        """
+        新建并登录一个 SMTP 连接（失败时抛出异常）
+
+        Returns:
+            smtplib.SMTP: 已登录的连接
+        """
+        if Config.SMTP_USE_SSL:
+            conn = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port)
+        else:
+            conn = smtplib.SMTP(self.smtp_server, self.smtp_port)
+            if Config.SMTP_USE_TLS:
+                conn.starttls()
+        _tune_socket(conn.sock)
+
+        # 登录
+        conn.login(self.email_account, self.email_password)
+        return conn
+
+    def _ensure_smtp_connection(self) -> bool:
+        """确保 SMTP 连接有效：没有连接时建立连接，闲置过久时先检查，失效则重连"""
+        if self.smtp_connection:
+            idle = time.monotonic() - self._smtp_last_use
+            if idle < self._SMTP_IDLE_CHECK_SECONDS or _smtp_alive(self.smtp_connection):
+                return True
+            print("→ SMTP 连接已断开，尝试重新连接...")
+            self.disconnect_smtp()
+
+        return self.connect_smtp()
+
+    def _sendmail(self, recipients: List[str], msg: bytes) -> Dict[str, Any]:
+        """
+        通过当前 SMTP 连接发送邮件，连接被服务器断开时重连并重试一次
+
+        Args:
+            recipients: 收件人列表
+            msg: 邮件内容
+
+        Returns:
+            Dict[str, Any]: sendmail 返回的被拒收件人
+        """
+        try:
+            result = _pipelined_sendmail(
+                self.smtp_connection, self.email_account, recipients, msg
+            )
+        except smtplib.SMTPServerDisconnected:
+            print("→ SMTP 连接已断开，重新连接后重试...")
+            self.disconnect_smtp()
+            if not self.connect_smtp():
+                raise
+            result = _pipelined_sendmail(
+                self.smtp_connection, self.email_account, recipients, msg
+            )
+
+        self._smtp_last_use = time.monotonic()
+        return result
+
+    @_smtp_locked
     def disconnect_smtp(self) -> None:
         """断开 SMTP 连接"""
         if self.smtp_connection:
@@ -195,28 +809,14 @@ class EmailClient:
         if not value:
             return ""
 
-        decoded_parts = decode_header(value)
-        result = []
-
-        for part, encoding in decoded_parts:
-            if isinstance(part, bytes):
-                try:
-                    if encoding:
-                        result.append(part.decode(encoding, errors="ignore"))
-                    else:
-                        result.append(part.decode("utf-8", errors="ignore"))
-                except (UnicodeDecodeError, LookupError):
-                    try:
-                        result.append(part.decode("utf-8", errors="ignore"))
-                    except Exception:
-                        result.append(part.decode("latin-1", errors="ignore"))
-            else:
-                try:
-                    result.append(str(part))
-                except Exception:
-                    result.append("")
+        if isinstance(value, str):
+            # 不含 RFC 2047 编码字（=?charset?...?=）的头部无需解码，直接返回
+            if "=?" not in value:
+                return value
+            # 同一发件人、邮件列表的头部反复出现，走带缓存的解码
+            return _decode_encoded_header(value)
 
-        return "".join(result)
+        return _decode_header_parts(value)
 
     def _find_folder(self, folder_type: str) -> Optional[str]:
         """根据文件夹类型查找实际的文件夹名称"""
@@ -228,42 +828,154 @@ class EmailClient:
             print(f"→ starred 类型将使用 INBOX + FLAGGED 筛选")
             return None
         
+        # 命中缓存（包括未找到的结果），不再重复 LIST 和匹配
+        if folder_type in self._folder_cache:
+            return self._folder_cache[folder_type]
+
         # 获取所有文件夹
         available_folders = self.list_folders()
         if not available_folders:
+            # LIST 失败时不缓存，下次重新查找
             return None
-        
+
+        actual_folder = self._match_folder(folder_type, available_folders)
+        self._folder_cache[folder_type] = actual_folder
+        return actual_folder
+
+    def _match_folder(
+        self, folder_type: str, available_folders: List[str]
+    ) -> Optional[str]:
+        """
+        在可用文件夹中匹配文件夹类型对应的实际文件夹
+
+        Args:
+            folder_type: 文件夹类型（如 sent、drafts）或文件夹名称
+            available_folders: 服务器上的文件夹列表
+
+        Returns:
+            Optional[str]: 实际文件夹名称，未找到返回 None
+        """
         # 从配置中获取可能的文件夹名称
         folder_type_lower = folder_type.lower()
         possible_names = Config.FOLDER_NAMES.get(folder_type_lower, [folder_type])
-        
+
+        # 预先计算集合和小写映射，避免在嵌套循环中重复调用 lower()
+        available_set = set(available_folders)
+        available_lower = [(folder, folder.lower()) for folder in available_folders]
+        available_by_lower: Dict[str, str] = {}
+        for actual_folder, actual_lower in available_lower:
+            available_by_lower.setdefault(actual_lower, actual_folder)
+        possible_lower = [name.lower() for name in possible_names]
+
         # 第一轮：精确匹配（优先UTF-7编码和英文名）
         for possible_name in possible_names:
-            if possible_name in available_folders:
+            if possible_name in available_set:
                 print(f"→ 精确匹配文件夹: {folder_type} -> {possible_name}")
                 return possible_name
         
         # 第二轮：模糊匹配（不区分大小写）
-        for possible_name in possible_names:
-            for actual_folder in available_folders:
-                if possible_name.lower() == actual_folder.lower():
-                    print(f"→ 大小写匹配文件夹: {folder_type} -> {actual_folder}")
-                    return actual_folder
+        for name_lower in possible_lower:
+            actual_folder = available_by_lower.get(name_lower)
+            if actual_folder is not None:
+                print(f"→ 大小写匹配文件夹: {folder_type} -> {actual_folder}")
+                return actual_folder
         
         # 第三轮：包含匹配
-        for possible_name in possible_names:
-            for actual_folder in available_folders:
-                if possible_name.lower() in actual_folder.lower() or actual_folder.lower() in possible_name.lower():
+        for name_lower in possible_lower:
+            for actual_folder, actual_lower in available_lower:
+                if name_lower in actual_lower or actual_lower in name_lower:
                     print(f"→ 模糊匹配文件夹: {folder_type} -> {actual_folder}")
                     return actual_folder
         
         # 如果没找到，尝试直接使用原始名称
-        if folder_type in available_folders:
+        if folder_type in available_set:
             return folder_type
         
         print(f"✗ 未找到文件夹类型: {folder_type}，可用文件夹: {available_folders}")
         return None
     
+    def _pipeline_commands(
+        self, commands: List[Tuple[str, ...]]
+    ) -> List[Tuple[str, List[Any]]]:
+        """
+        流水线方式执行多条 IMAP 命令：一次性发出全部命令，再按标签依次读取结果，
+        多条命令只需等待一次网络往返
+
+        服务器不支持 IMAP4rev1 时退回逐条执行。调用方负责保证命令之间没有依赖
+        （例如 COPY 成功前不能删除原邮件）
+
+        Args:
+            commands: 命令列表，每项为 (命令名, 参数...)
+
+        Returns:
+            List[Tuple[str, List[Any]]]: 与命令一一对应的 (状态, 数据)
+        """
+        conn = self.imap_connection
+        if len(commands) == 1 or "IMAP4REV1" not in conn.capabilities:
+            return [conn._simple_command(*command) for command in commands]
+
+        tags = [conn._command(*command) for command in commands]
+        results = [
+            conn._command_complete(command[0], tag)
+            for command, tag in zip(commands, tags)
+        ]
+
+        # STORE / EXPUNGE 的未标记响应无人读取，丢弃以免在连接上不断累积
+        conn.untagged_responses.pop("FETCH", None)
+        conn.untagged_responses.pop("EXPUNGE", None)
+        return results
+
+    def _get_conn_for_folder(self, folder: str) -> bool:
+        """
+        将活动连接切换到已选中目标文件夹的连接，避免在同一连接上反复 SELECT
+
+        当前连接连同其选中的文件夹放回连接池；池中有已选中目标文件夹的连接时直接复用，
+        否则新建连接（未达上限）或回收最久未使用的闲置连接，由调用方执行 SELECT
+
+        Args:
+            folder: 文件夹名称
+
+        Returns:
+            bool: 活动连接是否已选中该文件夹（True 时无需再 SELECT）；
+                新建连接失败时返回 False 且活动连接为 None
+        """
+        if self._current_folder == folder:
+            return True
+        if Config.IMAP_POOL_SIZE <= 1 or not self.imap_connection:
+            return False
+
+        pooled = self._imap_pool.pop(folder, None)
+        if pooled is None and self._current_folder is None:
+            # 活动连接未选中任何文件夹，直接在其上 SELECT 即可
+            return False
+
+        # 暂存当前连接，保留其已选中的文件夹供后续复用
+        if self._current_folder is not None:
+            self._imap_pool[self._current_folder] = (
+                self.imap_connection, self._last_activity
+            )
+        self.imap_connection = None
+        self._current_folder = None
+
+        if pooled is not None:
+            self.imap_connection, self._last_activity = pooled
+            self._current_folder = folder
+            if self._check_imap_connection():
+                print(f"→ 复用已选中文件夹的 IMAP 连接: {folder}")
+                return True
+            # 闲置连接已失效（已在检查中登出并丢弃），改用其他连接
+
+        if len(self._imap_pool) >= Config.IMAP_POOL_SIZE:
+            # 连接数已达上限，回收最久未使用的闲置连接
+            _, pooled = self._imap_pool.popitem(last=False)
+            self.imap_connection, self._last_activity = pooled
+            if self._check_imap_connection():
+                return False
+            # 失效的连接已在检查中登出并丢弃
+
+        self.connect_imap(keep_folder_cache=True)
+        return False
+
     def _select_folder(self, folder: str, retry_count: int = 2) -> bool:
         """
         选择邮件文件夹，支持163邮箱等特殊情况
@@ -279,6 +991,15 @@ class EmailClient:
         if not self._ensure_imap_connection():
             return False
 
+        # 已经选中该文件夹（或池中有已选中该文件夹的连接），跳过 SELECT（SELECT 对服务器开销较大）
+        if self._get_conn_for_folder(folder):
+            return True
+        if not self.imap_connection:
+            return False
+
+        requested_folder = folder
+        self._current_folder = None
+
         # QQ邮箱等邮件服务器要求包含空格的文件夹名必须用双引号包裹
         # 例如：Sent Messages -> "Sent Messages"
         if ' ' in folder and not (folder.startswith('"') and folder.endswith('"')):
@@ -293,6 +1014,7 @@ class EmailClient:
                 status, response = self.imap_connection.select(folder)
                 if status == "OK":
                     print(f"✓ 成功选择文件夹: {folder}")
+                    self._current_folder = requested_folder
                     return True
                 else:
                     print(f"✗ SELECT 失败: {folder}, status: {status}, response: {response}")
@@ -301,15 +1023,13 @@ class EmailClient:
                 print(f"✗ SELECT 异常 (尝试 {attempt + 1}/{retry_count + 1}): {folder}, error: {error_str}")
                 
                 # 检查是否是连接错误 (WinError 10054 等)
-                is_connection_error = any(keyword in error_str.lower() for keyword in [
-                    "10054", "连接", "connection", "abort", "socket", "broken", "reset", "eof"
-                ])
+                is_connection_error = _CONNECTION_ERROR_RE.search(error_str) is not None
                 
                 if is_connection_error and attempt < retry_count:
                     print(f"→ 检测到连接错误，尝试重新连接 ({attempt + 1}/{retry_count})...")
-                    self.disconnect_imap()
-                    import time
-                    time.sleep(1)  # 等待1秒再重连
+                    # 只丢弃出错的活动连接，连接池中的闲置连接不受影响
+                    self._discard_imap_connection(logout=False)
+                    self._reconnect_backoff(attempt)
                     if not self._ensure_imap_connection():
                         print(f"✗ 重新连接失败")
                         continue
@@ -335,9 +1055,8 @@ class EmailClient:
             # 如果是最后一次尝试，还可以尝试重连
             if attempt < retry_count:
                 print(f"→ 尝试重连后再试 ({attempt + 1}/{retry_count})...")
-                self.disconnect_imap()
-                import time
-                time.sleep(1)
+                self._discard_imap_connection(logout=True)
+                self._reconnect_backoff(attempt)
                 if not self._ensure_imap_connection():
                     print(f"✗ 重新连接失败")
                     return False
@@ -349,12 +1068,44 @@ class EmailClient:
         
         return False
 
-    def _get_email_body(self, msg: Message) -> str:
+    @staticmethod
+    def _reconnect_backoff(attempt: int) -> None:
+        """
+        重连前按指数退避等待（1s、2s、4s…，最多 30s），并加入随机抖动，
+        避免多个客户端在网络恢复后同时重连
+
+        Args:
+            attempt: 当前重试次数（从 0 开始）
+        """
+        time.sleep(min(2 ** attempt, 30) + random.uniform(0, 0.5))
+
+    def _select_if_needed(self, folder: str) -> bool:
+        """
+        仅当文件夹未被选中时才执行 SELECT（用于归档、删除、标记等写操作）
+
+        Args:
+            folder: 文件夹名称
+
+        Returns:
+            bool: 是否已选中该文件夹
+        """
+        if self._get_conn_for_folder(folder):
+            return True
+        if not self.imap_connection:
+            return False
+
+        status, _ = self.imap_connection.select(folder)
+        self._current_folder = folder if status == "OK" else None
+        return self._current_folder is not None
+
+    def _get_email_body(self, msg: Message, max_body_bytes: int = 256 * 1024) -> str:
         """
         提取邮件正文
 
         Args:
             msg: 邮件消息对象
+            max_body_bytes: 正文最多解码的字节数，超出部分在解码前截掉
+                （正文只用于展示和交给大模型，超大正文没有必要完整解码）
 
         Returns:
             str: 邮件正文内容
@@ -362,6 +1113,9 @@ class EmailClient:
         body = ""
 
         if msg.is_multipart():
+            # HTML 部分先记下，只有找不到纯文本部分时才解码和去标签
+            html_part = None
+
             # 多部分邮件
             for part in msg.walk():
                 content_type = part.get_content_type()
@@ -373,222 +1127,424 @@ class EmailClient:
 
                 # 获取文本内容
                 if content_type == "text/plain":
-                    try:
-                        payload = part.get_payload(decode=True)
-                        if payload:
-                            charset = part.get_content_charset() or "utf-8"
-                            body = payload.decode(charset, errors="ignore")  # type: ignore
-                            break
-                    except (UnicodeDecodeError, AttributeError):
-                        try:
-                            if payload:  # type: ignore
-                                body = payload.decode("utf-8", errors="ignore")  # type: ignore
-                                break
-                        except Exception:
-                            continue
-                elif content_type == "text/html" and not body:
-                    try:
-                        payload = part.get_payload(decode=True)
-                        if payload:
-                            charset = part.get_content_charset() or "utf-8"
-                            html_body = payload.decode(charset, errors="ignore")  # type: ignore
-                            # 简单去除HTML标签
-                            body = re.sub(r"<[^>]+>", "", html_body)
-                    except (UnicodeDecodeError, AttributeError):
-                        try:
-                            if payload:  # type: ignore
-                                html_body = payload.decode("utf-8", errors="ignore")  # type: ignore
-                                body = re.sub(r"<[^>]+>", "", html_body)
-                        except Exception:
-                            continue
+                    payload = part.get_payload(decode=True)
+                    if payload:
+                        body = _decode_payload(
+                            payload[:max_body_bytes], part.get_content_charset()  # type: ignore
+                        )
+                        break
+                elif content_type == "text/html" and html_part is None:
+                    html_part = part
+
+            if not body and html_part is not None:
+                payload = html_part.get_payload(decode=True)
+                if payload:
+                    html_body = _decode_payload(
+                        payload[:max_body_bytes], html_part.get_content_charset()  # type: ignore
+                    )
+                    # 简单去除HTML标签
+                    body = _html_to_text(html_body)
         else:
             # 单部分邮件
-            try:
-                payload = msg.get_payload(decode=True)
-                if payload:
-                    charset = msg.get_content_charset() or "utf-8"
-                    body = payload.decode(charset, errors="ignore")  # type: ignore
-                else:
-                    body = str(msg.get_payload())
-            except (UnicodeDecodeError, AttributeError):
-                try:
-                    if payload:  # type: ignore
-                        body = payload.decode("utf-8", errors="ignore")  # type: ignore
-                    else:
-                        body = str(msg.get_payload())
-                except Exception:
-                    body = str(msg.get_payload())
+            payload = msg.get_payload(decode=True)
+            if payload:
+                body = _decode_payload(
+                    payload[:max_body_bytes], msg.get_content_charset()  # type: ignore
+                )
+            else:
+                body = str(msg.get_payload())
 
         return body.strip()
 
-    def get_email(self, email_id: str, lightweight: bool = False) -> Optional[Dict[str, Any]]:
+    def _clear_message_caches(self) -> None:
+        """清空邮件列表缓存和完整邮件缓存（删除、归档、标记等写操作前调用）"""
+        self._listing_cache.clear()
+        self._email_cache.clear()
+
+    def _get_cached_email(self, folder: str, email_id: str) -> Optional[Dict[str, Any]]:
+        """
+        从完整邮件缓存中取出邮件信息
+
+        Args:
+            folder: 邮件所在文件夹
+            email_id: 邮件 ID
+
+        Returns:
+            Optional[Dict[str, Any]]: 邮件信息副本，未命中或已过期返回 None
+        """
+        key = (folder, email_id)
+        cached = self._email_cache.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] >= self._EMAIL_CACHE_TTL:
+            del self._email_cache[key]
+            return None
+        self._email_cache.move_to_end(key)
+        # 返回副本，调用方修改结果不影响缓存
+        return dict(cached[1])
+
+    def _put_cached_email(self, folder: str, email_id: str, email_info: Dict[str, Any]) -> None:
+        """
+        将完整邮件信息放入缓存，超出上限时淘汰最久未使用的条目
+
+        Args:
+            folder: 邮件所在文件夹
+            email_id: 邮件 ID
+            email_info: 邮件信息（不含 raw_message）
+        """
+        self._email_cache[(folder, email_id)] = (time.monotonic(), dict(email_info))
+        self._email_cache.move_to_end((folder, email_id))
+        while len(self._email_cache) > self._EMAIL_CACHE_SIZE:
+            self._email_cache.popitem(last=False)
+
+    @_imap_locked
+    def get_email(
+        self,
+        email_id: str,
+        lightweight: bool = False,
+        skip_select: bool = False,
+        retain_raw: bool = False,
+    ) -> Optional[Dict[str, Any]]:
         """
         根据邮件 ID 获取邮件信息
 
+        使用 BODY.PEEK[] 获取完整邮件，读取邮件不会设置 \\Seen 标记，
+        返回的 seen 字段反映的是获取前的已读状态
+
         Args:
             email_id: 邮件 ID（IMAP UID）
             lightweight: 是否只获取轻量级信息（不获取正文，速度更快）
+            skip_select: 调用方已选好文件夹时跳过 SELECT，直接在当前文件夹中获取
+            retain_raw: 是否在结果中保留解析后的邮件对象（raw_message），
+                默认不保留，避免长期持有整封邮件（含附件）占用内存
 
         Returns:
             Optional[Dict[str, Any]]: 邮件信息字典，失败返回 None
         """
+        # 只缓存不含邮件对象的完整邮件，轻量级请求本身已足够便宜
+        folder = self._current_folder if skip_select else Config.DEFAULT_FOLDER
+        use_cache = folder is not None and not lightweight and not retain_raw
+        if use_cache:
+            cached = self._get_cached_email(folder, email_id) # type: ignore
+            if cached is not None:
+                return cached
+
         if not self._ensure_imap_connection():
             return None
 
         try:
             # 选择收件箱
-            if not self._select_folder(Config.DEFAULT_FOLDER):
+            if not skip_select and not self._select_folder(Config.DEFAULT_FOLDER):
                 return None
 
-            # 如果是轻量级模式，只获取ENVELOPE和FLAGS
-            if lightweight:
-                status, data = self.imap_connection.fetch(
-                    email_id, "(ENVELOPE FLAGS BODY.PEEK[HEADER.FIELDS (SUBJECT FROM TO DATE)])"
-                ) # type: ignore
-            else:
-                # 获取邮件和FLAGS
-                status, data = self.imap_connection.fetch(email_id, "(RFC822 FLAGS)") # type: ignore
-
-            if status != "OK":
+            fetched = self._fetch_many([email_id], lightweight)
+            if not fetched:
                 print(f"✗ 获取邮件失败: {email_id}")
                 return None
 
-            # 解析邮件
-            raw_email = data[0][1] # type: ignore
-            msg = email.message_from_bytes(raw_email) # type: ignore
-            
-            # 解析FLAGS
-            flags_data = data[0][0] if len(data[0]) > 0 else b''
-            flags_str = flags_data.decode() if isinstance(flags_data, bytes) else str(flags_data)
-            seen = '\\Seen' in flags_str
-            flagged = '\\Flagged' in flags_str
-
-            # 提取邮件信息
-            subject = self._decode_header_value(msg.get("Subject", ""))
-            from_header = msg.get("From", "")
-            from_name, from_addr = parseaddr(from_header)
-            from_name = self._decode_header_value(from_name)
-
-            to_header = msg.get("To", "")
-            date = msg.get("Date", "")
-
-            # 获取邮件正文（轻量级模式下跳过以提升速度）
-            if lightweight:
-                body = ""  # 轻量级模式不获取正文
-            else:
-                body = self._get_email_body(msg)
-
-            email_info = {
-                "id": email_id,
-                "subject": subject,
-                "from": from_addr,
-                "from_name": from_name,
-                "to": to_header,
-                "date": date,
-                "body": body,
-                "raw_message": msg if not lightweight else None,
-                "seen": seen,
-                "flagged": flagged,
-            }
-
+            flags_data, raw_email = next(iter(fetched.values()))
+            email_info = self._build_email_info(
+                email_id, raw_email, flags_data, lightweight, retain_raw
+            )
+            if use_cache:
+                self._put_cached_email(folder, email_id, email_info) # type: ignore
             return email_info
 
         except Exception as e:
             print(f"✗ 获取邮件异常: {str(e)}")
+            self._handle_imap_error(e)
             return None
 
-    def get_recent_emails(
-        self, count: int = 10, days: int = 30, folder: str = None # type: ignore
-    ) -> List[Dict[str, Any]]:
+    def _build_email_info(
+        self,
+        email_id: str,
+        raw_email: bytes,
+        flags_data: Any,
+        lightweight: bool,
+        retain_raw: bool = False,
+    ) -> Dict[str, Any]:
         """
-        获取最近的邮件列表
+        根据 FETCH 返回的原始数据构建邮件信息字典
 
         Args:
-            count: 获取的邮件数量
-            days: 获取最近多少天的邮件
-            folder: 邮件文件夹，默认为收件箱。可以是"sent"、"drafts"等类型名，会自动匹配实际文件夹
+            email_id: 邮件 ID
+            raw_email: 邮件原始内容（完整邮件或仅头部）
+            flags_data: FETCH 响应中包含 FLAGS 的部分
+            lightweight: 是否为轻量级模式（不解析正文）
+            retain_raw: 是否保留完整邮件对象（轻量级模式下始终不保留）
 
         Returns:
-            List[Dict[str, Any]]: 邮件信息列表
+            Dict[str, Any]: 邮件信息字典
         """
-        if not self._ensure_imap_connection():
-            return []
-
-        try:
-            folder = folder or Config.DEFAULT_FOLDER
-            original_folder = folder
-            use_starred_filter = False
-            
-            # 如果不是INBOX，尝试智能匹配文件夹
-            if folder.upper() != "INBOX":
-                actual_folder = self._find_folder(folder)
-                if actual_folder:
-                    folder = actual_folder
-                elif original_folder.lower() == "starred":
-                    # starred 类型找不到独立文件夹，使用 INBOX + FLAGGED 筛选
-                    print(f"→ starred 类型没有独立文件夹，将从 INBOX 筛选 FLAGGED 邮件")
-                    folder = "INBOX"
-                    use_starred_filter = True
-                else:
-                    print(f"✗ 找不到文件夹 {folder}，返回空列表")
-                    return []
-            
-            # 使用新的 _select_folder 方法
-            if not self._select_folder(folder):
-                print(f"✗ 无法选择文件夹 {folder}，返回空列表")
-                return []
+        # 解析邮件（轻量级模式只解析头部）
+        if lightweight:
+            msg = _HEADER_PARSER.parsebytes(raw_email)
+        else:
+            msg = email.message_from_bytes(raw_email) # type: ignore
 
-            # 搜索最近30天的邮件，如果找不到则搜索所有邮件
-            from datetime import datetime, timedelta
+        # 解析FLAGS（直接在字节串上匹配，按完整标记名判断）
+        if not isinstance(flags_data, bytes):
+            flags_data = str(flags_data).encode()
+        match = _FLAGS_RE.search(flags_data)
+        flags = set(match.group(1).split()) if match else set()
+        seen = b"\\Seen" in flags
+        flagged = b"\\Flagged" in flags
+
+        # 提取邮件信息
+        subject = self._decode_header_value(msg.get("Subject", ""))
+        from_header = msg.get("From", "")
+        from_name, from_addr = parseaddr(from_header)
+        # 大多数显示名是纯文本，不含编码字时连方法调用也省去
+        if "=?" in from_name:
+            from_name = self._decode_header_value(from_name)
 
-            thirty_days_ago = (datetime.now() - timedelta(days=days)).strftime(
-                "%d-%b-%Y"
-            )
+        to_header = msg.get("To", "")
+        date = msg.get("Date", "")
 
-            # 先尝试搜索最近30天的邮件
-            status, messages = self.imap_connection.search( # type: ignore
-                None, f"SINCE {thirty_days_ago}"
-            )
+        # 获取邮件正文（轻量级模式下跳过以提升速度）
+        if lightweight:
+            body = ""  # 轻量级模式不获取正文
+        else:
+            body = self._get_email_body(msg)
 
-            if status != "OK" or not messages[0]:
-                # 如果搜索失败或没有结果，则搜索所有邮件
-                status, messages = self.imap_connection.search(None, "ALL") # type: ignore
+        return {
+            "id": email_id,
+            "subject": subject,
+            "from": from_addr,
+            "from_name": from_name,
+            "to": to_header,
+            "date": date,
+            "body": body,
+            "raw_message": msg if retain_raw and not lightweight else None,
+            "seen": seen,
+            "flagged": flagged,
+        }
 
-                if status != "OK":
-                    return []
+    def _fetch_many(
+        self, email_ids: List[str], lightweight: bool
+    ) -> Optional[Dict[bytes, Any]]:
+        """
+        用一条 FETCH 命令获取当前文件夹中的多封邮件（ID 过多时分段）
 
-            # 获取邮件ID列表
-            email_ids = messages[0].split()
+        Args:
+            email_ids: 邮件 ID 列表
+            lightweight: 是否只获取 FLAGS 和必要的头部字段
 
-            if not email_ids:
-                return []
+        Returns:
+            Optional[Dict[bytes, Any]]: 邮件 ID -> (FLAGS 数据, 邮件内容)，FETCH 失败返回 None
+        """
+        if lightweight:
+            items = "(FLAGS BODY.PEEK[HEADER.FIELDS (SUBJECT FROM TO DATE)])"
+        else:
+            # 获取邮件和FLAGS（BODY.PEEK[] 不会把邮件标记为已读）
+            items = "(BODY.PEEK[] FLAGS)"
+
+        fetched: Dict[bytes, Any] = {}
+        for message_set in _message_sets(email_ids):
+            status, data = self.imap_connection.fetch(message_set, items) # type: ignore
+            if status != "OK":
+                print(f"✗ 获取邮件失败: {message_set}")
+                return None
+            # FLAGS 可能出现在邮件内容之前或之后，统一合并后解析
+            fetched.update(self._parse_fetch_response(data))
+        return fetched
+
+    def _parse_fetch_response(self, data: List[Any]) -> Dict[bytes, Any]:
+        """
+        解析一次 FETCH 多封邮件的响应
+
+        imaplib 返回的列表中，每封邮件对应一个 (前缀, 字面量) 元组，
+        其后可能跟随一个包含剩余数据项（如放在字面量之后的 FLAGS）的字节串
+
+        Args:
+            data: imaplib fetch 返回的数据列表
+
+        Returns:
+            Dict[bytes, Any]: 邮件序号 -> (FLAGS 等元数据, 字面量内容)
+        """
+        parsed: Dict[bytes, Any] = {}
+        last_id = None
+
+        for item in data:
+            if isinstance(item, tuple):
+                prefix, literal = item[0], item[1]
+                if prefix[:1].isdigit():
+                    last_id = prefix.split(None, 1)[0]
+                    parsed[last_id] = (prefix, literal)
+                elif last_id is not None:
+                    # 同一封邮件的后续字面量，请求中邮件内容总是最后一项
+                    meta, _ = parsed[last_id]
+                    parsed[last_id] = (meta + prefix, literal)
+            elif isinstance(item, bytes) and last_id is not None:
+                # 以数字开头的是服务器主动推送的其他 FETCH 响应，忽略
+                if item[:1].isdigit():
+                    continue
+                prefix, literal = parsed[last_id]
+                parsed[last_id] = (prefix + item, literal)
+
+        return parsed
 
-            # 获取最近的N封邮件（从最新的开始）
-            if len(email_ids) > count:
-                recent_ids = email_ids[-count:]  # 获取最后N封邮件（最新的）
+    def _list_recent_ids(
+        self, count: int, days: int, folder: str
+    ) -> List[bytes]:
+        """
+        选择文件夹并搜索最近的邮件ID（只执行 SEARCH，不获取邮件内容）
+
+        调用方需持有 IMAP 锁并已确保连接可用，网络异常向上抛出
+
+        Args:
+            count: 需要的邮件数量
+            days: 搜索最近多少天的邮件
+            folder: 邮件文件夹，可以是"sent"、"drafts"等类型名
+
+        Returns:
+            List[bytes]: 邮件ID列表（最新的在前），文件夹无法使用或搜索失败时返回空列表
+        """
+        original_folder = folder
+        use_starred_filter = False
+        
+        # 如果不是INBOX，尝试智能匹配文件夹
+        if folder.upper() != "INBOX":
+            actual_folder = self._find_folder(folder)
+            if actual_folder:
+                folder = actual_folder
+            elif original_folder.lower() == "starred":
+                # starred 类型找不到独立文件夹，使用 INBOX + FLAGGED 筛选
+                print(f"→ starred 类型没有独立文件夹，将从 INBOX 筛选 FLAGGED 邮件")
+                folder = "INBOX"
+                use_starred_filter = True
             else:
-                recent_ids = email_ids
+                print(f"✗ 找不到文件夹 {folder}，返回空列表")
+                return []
+        
+        # 使用新的 _select_folder 方法
+        if not self._select_folder(folder):
+            print(f"✗ 无法选择文件夹 {folder}，返回空列表")
+            return []
 
-            recent_ids = list(reversed(recent_ids))  # 最新的在前
+        # 搜索最近30天的邮件，如果找不到则搜索所有邮件
+        from datetime import datetime, timedelta
+
+        thirty_days_ago = (datetime.now() - timedelta(days=days)).strftime(
+            "%d-%b-%Y"
+        )
+
+        # 星标筛选交给服务器完成，只返回带 \\Flagged 标记的邮件
+        base_criteria = "FLAGGED" if use_starred_filter else "ALL"
+
+        # 先尝试搜索最近30天的邮件
+        status, messages = self.imap_connection.search( # type: ignore
+            None, base_criteria, f"SINCE {thirty_days_ago}"
+        )
+
+        if status != "OK" or not messages[0]:
+            # 如果搜索失败或没有结果，则搜索所有邮件
+            status, messages = self.imap_connection.search(None, base_criteria) # type: ignore
+
+            if status != "OK":
+                return []
+
+        # 获取邮件ID列表
+        email_ids = messages[0].split()
+
+        if not email_ids:
+            return []
+
+        # 获取最近的N封邮件（从最新的开始）
+        if len(email_ids) > count:
+            recent_ids = email_ids[-count:]  # 获取最后N封邮件（最新的）
+        else:
+            recent_ids = email_ids
+
+        return list(reversed(recent_ids))  # 最新的在前
+
+    def _build_listing_info(
+        self, email_id: bytes, index: int, fetched: Dict[bytes, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        从批量 FETCH 结果构建列表项（轻量级邮件信息 + 时间排序索引）
+
+        Args:
+            email_id: 邮件ID
+            index: 时间排序的索引（从1开始）
+            fetched: _fetch_many 返回的结果
+
+        Returns:
+            Optional[Dict[str, Any]]: 邮件信息，缺失或解析失败返回 None
+        """
+        if email_id not in fetched:
+            return None
+
+        flags_data, raw_email = fetched[email_id]
+        try:
+            email_info = self._build_email_info(
+                email_id.decode(), raw_email, flags_data, lightweight=True
+            )
+        except Exception as e:
+            print(f"✗ 解析邮件异常: {email_id.decode()}, {str(e)}")
+            return None
+
+        if email_info:
+            # 添加时间排序的索引（从1开始）
+            email_info["index"] = index
+            # 保存原始IMAP UID用于后续操作
+            email_info["original_uid"] = email_id.decode()
+        return email_info
+
+    @_imap_locked
+    def get_recent_emails(
+        self, count: int = 10, days: int = 30, folder: str = None # type: ignore
+    ) -> List[Dict[str, Any]]:
+        """
+        获取最近的邮件列表
+
+        Args:
+            count: 获取的邮件数量
+            days: 获取最近多少天的邮件
+            folder: 邮件文件夹，默认为收件箱。可以是"sent"、"drafts"等类型名，会自动匹配实际文件夹
+
+        Returns:
+            List[Dict[str, Any]]: 邮件信息列表
+        """
+        folder = folder or Config.DEFAULT_FOLDER
+        cache_key = (folder, count, days)
+        cached = self._listing_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self._LISTING_CACHE_TTL:
+            # 返回副本，调用方修改结果不影响缓存
+            return [dict(email_info) for email_info in cached[1]]
+
+        if not self._ensure_imap_connection():
+            return []
+
+        try:
+            recent_ids = self._list_recent_ids(count, days, folder)
+            if not recent_ids:
+                return []
+
+            # 一次 FETCH 获取所有邮件的头部和FLAGS（轻量级模式，不获取正文），
+            # 避免逐封请求带来的多次网络往返
+            fetched = self._fetch_many(
+                [email_id.decode() for email_id in recent_ids], lightweight=True
+            )
+            if fetched is None:
+                print("✗ 获取邮件列表失败")
+                return []
 
             emails = []
             for index, email_id in enumerate(recent_ids, 1):
-                # 使用轻量级模式快速获取邮件列表（不获取正文）
-                email_info = self.get_email(email_id.decode(), lightweight=True)
+                email_info = self._build_listing_info(email_id, index, fetched)
                 if email_info:
-                    # 如果需要筛选星标邮件，跳过未标记的
-                    if use_starred_filter and not email_info.get('flagged', False):
-                        continue
-                    # 添加时间排序的索引（从1开始）
-                    email_info["index"] = index
-                    # 保存原始IMAP UID用于后续操作
-                    email_info["original_uid"] = email_id.decode()
                     emails.append(email_info)
 
+            self._listing_cache[cache_key] = (
+                time.monotonic(),
+                [dict(email_info) for email_info in emails],
+            )
             return emails
 
         except Exception as e:
             print(f"✗ 获取邮件列表异常: {str(e)}")
+            self._handle_imap_error(e)
             return []
 
     def get_email_by_index(
@@ -599,21 +1555,56 @@ class EmailClient:
 
         Args:
             index: 时间排序的索引（从1开始）
-            count: 获取的邮件数量（用于确保索引在范围内）
+            count: 保留以兼容旧调用，只会获取目标邮件本身
             folder: 邮件文件夹，默认为收件箱
 
         Returns:
             Optional[Dict[str, Any]]: 邮件信息，失败返回 None
         """
-        # 获取足够多的邮件以确保索引在范围内
-        emails = self.get_recent_emails(count=max(count, index), folder=folder)
+        emails = self.get_emails_by_indices([index], count=count, folder=folder)
+        return emails[0] if emails else None
 
-        if not emails or index < 1 or index > len(emails):
-            return None
+    def _build_outgoing(
+        self,
+        to_addr: Optional[str],
+        subject: str,
+        content: str,
+        cc: Optional[List[str]] = None,
+        bcc: Optional[List[str]] = None,
+    ) -> bytes:
+        """
+        构建待发送的纯文本邮件并序列化为字节串
+
+        直接用 BytesGenerator 按 SMTP 策略（CRLF 换行）输出，
+        省去 as_string() 的字符串中转，交给 sendmail 时也不会再做换行转换
+
+        Args:
+            to_addr: 收件人地址，为 None 时不生成 To 头部（由调用方按收件人补上）
+            subject: 邮件主题
+            content: 邮件正文
+            cc: 抄送列表
+            bcc: 密送列表
+
+        Returns:
+            bytes: 可直接传给 sendmail 的邮件内容
+        """
+        msg = MIMEText(content, "plain", "utf-8", policy=policy.SMTP)
+        msg["From"] = self.email_account
+        if to_addr is not None:
+            msg["To"] = to_addr
+        # 原邮件主题可能带有折行（CRLF + 空白），SMTP 策略不允许头部值包含换行
+        msg["Subject"] = " ".join(subject.split()) if "\n" in subject else subject
+
+        if cc:
+            msg["Cc"] = ", ".join(cc)
+        if bcc:
+            msg["Bcc"] = ", ".join(bcc)
 
-        # 返回指定索引的邮件（索引从1开始，数组从0开始）
-        return emails[index - 1]
+        buffer = BytesIO()
+        BytesGenerator(buffer, policy=policy.SMTP).flatten(msg)
+        return buffer.getvalue()
 
+    @_smtp_locked
     def send_reply(self, original_email: Dict[str, Any], reply_content: str) -> bool:
         """
         发送邮件回复
@@ -625,25 +1616,18 @@ class EmailClient:
         Returns:
             bool: 发送是否成功
         """
-        if not self.smtp_connection:
-            if not self.connect_smtp():
-                return False
+        if not self._ensure_smtp_connection():
+            return False
 
         try:
             # 创建回复邮件
-            msg = MIMEMultipart()
-            msg["From"] = self.email_account
-            msg["To"] = original_email["from"]
-            msg["Subject"] = f"Re: {original_email['subject']}"
-
-            # 添加回复内容
-            msg.attach(MIMEText(reply_content, "plain", "utf-8"))
+            msg = self._build_outgoing(
+                original_email["from"], f"Re: {original_email['subject']}", reply_content
+            )
 
             # 发送邮件
             recipients = [original_email["from"]]
-            self.smtp_connection.sendmail(
-                self.email_account, recipients, msg.as_string()
-            )
+            self._sendmail(recipients, msg)
             print(f"✓ 回复邮件已发送到: {original_email['from']}")
             return True
 
@@ -651,6 +1635,7 @@ class EmailClient:
             print(f"✗ 发送回复失败: {str(e)}")
             return False
 
+    @_smtp_locked
     def send_email(
         self,
         to_addr: str,
@@ -672,22 +1657,11 @@ class EmailClient:
         Returns:
             bool: 发送是否成功
         """
-        if not self.smtp_connection:
-            if not self.connect_smtp():
-                return False
+        if not self._ensure_smtp_connection():
+            return False
 
         try:
-            msg = MIMEMultipart()
-            msg["From"] = self.email_account
-            msg["To"] = to_addr
-            msg["Subject"] = subject
-
-            if cc:
-                msg["Cc"] = ", ".join(cc)
-            if bcc:
-                msg["Bcc"] = ", ".join(bcc)
-
-            msg.attach(MIMEText(content, "plain", "utf-8"))
+            msg = self._build_outgoing(to_addr, subject, content, cc, bcc)
 
             # 发送邮件
             recipients = [to_addr]
@@ -696,9 +1670,7 @@ class EmailClient:
             if bcc:
                 recipients.extend(bcc)
 
-            self.smtp_connection.sendmail(
-                self.email_account, recipients, msg.as_string()
-            )
+            self._sendmail(recipients, msg)
             print(f"✓ 邮件已发送到: {to_addr}")
             return True
 
@@ -717,30 +1689,64 @@ class EmailClient:
         Returns:
             bool: 归档是否成功
         """
-        if not self.imap_connection:
-            if not self.connect_imap():
-                return False
+        return self.archive_emails_to_folder([email_id], folder_name)
+
+    @_imap_locked
+    def archive_emails_to_folder(self, email_ids: List[str], folder_name: str) -> bool:
+        """
+        将多封邮件一次性归档到指定文件夹
+
+        使用序列集合（如 1,3,5）在一条 COPY / STORE 命令中处理全部邮件，
+        最后只执行一次 EXPUNGE，避免逐封归档时 EXPUNGE 导致后续序号偏移
+
+        Args:
+            email_ids: 邮件 ID 列表
+            folder_name: 目标文件夹名称
+
+        Returns:
+            bool: 归档是否成功
+        """
+        if not email_ids:
+            return True
+
+        self._clear_message_caches()
+        if not self._ensure_imap_connection():
+            return False
 
         try:
             # 选择当前文件夹
-            self.imap_connection.select(Config.DEFAULT_FOLDER)
+            if not self._select_if_needed(Config.DEFAULT_FOLDER):
+                print(f"✗ 无法选择文件夹: {Config.DEFAULT_FOLDER}")
+                return False
 
-            # 复制邮件到目标文件夹
-            result = self.imap_connection.copy(email_id, folder_name)
+            message_sets = _message_sets(email_ids)
 
-            if result[0] == "OK":
-                # 标记原邮件为已删除
-                self.imap_connection.store(email_id, "+FLAGS", "\\Deleted")
-                # 永久删除标记为删除的邮件
-                self.imap_connection.expunge()
-                print(f"✓ 邮件已归档到: {folder_name}")
-                return True
-            else:
-                print("✗ 归档邮件失败")
-                return False
+            # 复制邮件到目标文件夹（全部复制成功后才删除原邮件）
+            for message_set in message_sets:
+                result = self.imap_connection.copy(message_set, folder_name)
+                if result[0] != "OK":
+                    print("✗ 归档邮件失败")
+                    return False
+
+            # 标记原邮件为已删除并永久删除（流水线发送，只等待一次往返）
+            results = self._pipeline_commands(
+                [
+                    ("STORE", message_set, "+FLAGS", "(\\Deleted)")
+                    for message_set in message_sets
+                ]
+                + [("EXPUNGE",)]
+            )
+            for status, _ in results:
+                if status != "OK":
+                    # 已复制到目标文件夹，但原邮件未能删除
+                    print(f"✗ 归档邮件失败，原邮件未删除: {status}")
+                    return False
+            print(f"✓ {len(email_ids)} 封邮件已归档到: {folder_name}")
+            return True
 
         except Exception as e:
             print(f"✗ 归档邮件异常: {str(e)}")
+            self._handle_imap_error(e)
             return False
 
     def delete_email(self, email_id: str) -> bool:
@@ -753,51 +1759,68 @@ class EmailClient:
         Returns:
             bool: 删除是否成功
         """
-        if not self.imap_connection:
-            if not self.connect_imap():
-                return False
+        return self.delete_emails([email_id])
+
+    @_imap_locked
+    def delete_emails(self, email_ids: List[str]) -> bool:
+        """
+        一次性删除多封邮件（单条 STORE 命令加一次 EXPUNGE）
+
+        Args:
+            email_ids: 邮件 ID 列表
+
+        Returns:
+            bool: 删除是否成功
+        """
+        if not email_ids:
+            return True
+
+        self._clear_message_caches()
+        if not self._ensure_imap_connection():
+            return False
 
         try:
             # 选择收件箱
-            self.imap_connection.select(Config.DEFAULT_FOLDER)
-
-            # 标记邮件为已删除
-            self.imap_connection.store(email_id, "+FLAGS", "\\Deleted")
+            if not self._select_if_needed(Config.DEFAULT_FOLDER):
+                print(f"✗ 无法选择文件夹: {Config.DEFAULT_FOLDER}")
+                return False
 
-            # 永久删除
-            self.imap_connection.expunge()
+            # 标记邮件为已删除并永久删除（流水线发送，只等待一次往返）
+            results = self._pipeline_commands(
+                [
+                    ("STORE", message_set, "+FLAGS", "(\\Deleted)")
+                    for message_set in _message_sets(email_ids)
+                ]
+                + [("EXPUNGE",)]
+            )
+            for status, _ in results:
+                if status != "OK":
+                    print(f"✗ 删除邮件失败: {status}")
+                    return False
 
-            print(f"✓ 邮件已删除: {email_id}")
+            print(f"✓ 邮件已删除: {','.join(email_ids)}")
             return True
 
         except Exception as e:
             print(f"✗ 删除邮件失败: {str(e)}")
+            self._handle_imap_error(e)
             return False
 
-    def forward_email(self, original_email: Dict[str, Any], forward_to: str) -> bool:
+    def _build_forward(
+        self, original_email: Dict[str, Any], forward_to: Optional[str]
+    ) -> bytes:
         """
-        转发邮件
+        构建转发邮件（转发说明加原邮件内容）
 
         Args:
             original_email: 原始邮件信息
-            forward_to: 转发目标邮箱
+            forward_to: 转发目标邮箱，为 None 时不生成 To 头部
 
         Returns:
-            bool: 转发是否成功
+            bytes: 可直接传给 sendmail 的邮件内容
         """
-        if not self.smtp_connection:
-            if not self.connect_smtp():
-                return False
-
-        try:
-            # 创建转发邮件
-            msg = MIMEMultipart()
-            msg["From"] = self.email_account
-            msg["To"] = forward_to
-            msg["Subject"] = f"Fwd: {original_email['subject']}"
-
-            # 添加转发说明和原邮件内容
-            forward_content = f"""
+        # 添加转发说明和原邮件内容
+        forward_content = f"""
 ---------- Forwarded message ---------
 From: {original_email["from_name"]} <{original_email["from"]}>
 Date: {original_email["date"]}
@@ -806,13 +1829,32 @@ Subject: {original_email["subject"]}
 {original_email["body"]}
 """
 
-            msg.attach(MIMEText(forward_content, "plain", "utf-8"))
+        return self._build_outgoing(
+            forward_to, f"Fwd: {original_email['subject']}", forward_content
+        )
+
+    @_smtp_locked
+    def forward_email(self, original_email: Dict[str, Any], forward_to: str) -> bool:
+        """
+        转发邮件
+
+        Args:
+            original_email: 原始邮件信息
+            forward_to: 转发目标邮箱
+
+        Returns:
+            bool: 转发是否成功
+        """
+        if not self._ensure_smtp_connection():
+            return False
+
+        try:
+            # 创建转发邮件
+            msg = self._build_forward(original_email, forward_to)
 
             # 发送邮件
             recipients = [forward_to]
-            result = self.smtp_connection.sendmail(
-                self.email_account, recipients, msg.as_string()
-            )
+            result = self._sendmail(recipients, msg)
 
             # 检查发送结果
             if result:
@@ -838,19 +1880,7 @@ Subject: {original_email["subject"]}
         Returns:
             bool: 标记是否成功
         """
-        if not self.imap_connection:
-            if not self.connect_imap():
-                return False
-
-        try:
-            self.imap_connection.select(Config.DEFAULT_FOLDER)
-            self.imap_connection.store(email_id, "+FLAGS", "\\Seen")
-            print(f"✓ 邮件已标记为已读: {email_id}")
-            return True
-
-        except Exception as e:
-            print(f"✗ 标记邮件失败: {str(e)}")
-            return False
+        return self.mark_emails_as_read([email_id])
 
     def mark_email_as_unread(self, email_id: str) -> bool:
         """
@@ -862,18 +1892,77 @@ Subject: {original_email["subject"]}
         Returns:
             bool: 标记是否成功
         """
-        if not self.imap_connection:
-            if not self.connect_imap():
-                return False
+        return self.mark_emails_as_unread([email_id])
+
+    def mark_emails_as_read(self, email_ids: List[str]) -> bool:
+        """
+        一次性将多封邮件标记为已读（单条 STORE 命令）
+
+        Args:
+            email_ids: 邮件 ID 列表
+
+        Returns:
+            bool: 标记是否成功
+        """
+        if not self._store_flags(email_ids, "+FLAGS", "\\Seen"):
+            return False
+        print(f"✓ 邮件已标记为已读: {','.join(email_ids)}")
+        return True
+
+    def mark_emails_as_unread(self, email_ids: List[str]) -> bool:
+        """
+        一次性将多封邮件标记为未读（单条 STORE 命令）
+
+        Args:
+            email_ids: 邮件 ID 列表
+
+        Returns:
+            bool: 标记是否成功
+        """
+        if not self._store_flags(email_ids, "-FLAGS", "\\Seen"):
+            return False
+        print(f"✓ 邮件已标记为未读: {','.join(email_ids)}")
+        return True
+
+    @_imap_locked
+    def _store_flags(self, email_ids: List[str], command: str, flag: str) -> bool:
+        """
+        用序列集合批量修改收件箱中邮件的标记
+
+        Args:
+            email_ids: 邮件 ID 列表
+            command: STORE 操作（+FLAGS / -FLAGS）
+            flag: 标记名称（如 \\Seen）
+
+        Returns:
+            bool: 是否全部修改成功
+        """
+        if not email_ids:
+            return True
+
+        self._clear_message_caches()
+        if not self._ensure_imap_connection():
+            return False
 
         try:
-            self.imap_connection.select(Config.DEFAULT_FOLDER)
-            self.imap_connection.store(email_id, "-FLAGS", "\\Seen")
-            print(f"✓ 邮件已标记为未读: {email_id}")
+            if not self._select_if_needed(Config.DEFAULT_FOLDER):
+                print(f"✗ 无法选择文件夹: {Config.DEFAULT_FOLDER}")
+                return False
+            results = self._pipeline_commands(
+                [
+                    ("STORE", message_set, command, f"({flag})")
+                    for message_set in _message_sets(email_ids)
+                ]
+            )
+            for status, _ in results:
+                if status != "OK":
+                    print(f"✗ 标记邮件失败: {status}")
+                    return False
             return True
 
         except Exception as e:
             print(f"✗ 标记邮件失败: {str(e)}")
+            self._handle_imap_error(e)
             return False
 
     def move_email_to_folder(self, email_id: str, folder_name: str) -> bool:
@@ -887,7 +1976,7 @@ Subject: {original_email["subject"]}
         Returns:
             bool: 移动是否成功
         """
-        return self.archive_email_to_folder(email_id, folder_name)
+        return self.archive_emails_to_folder([email_id], folder_name)
 
     def __enter__(self):
         """上下文管理器入口"""
@@ -900,6 +1989,7 @@ Subject: {original_email["subject"]}
         self.disconnect_imap()
         self.disconnect_smtp()
 
+    @_imap_locked
     def get_emails_by_ids(
         self, email_ids: List[str], folder: str = None
     ) -> List[Dict[str, Any]]:
@@ -913,55 +2003,121 @@ Subject: {original_email["subject"]}
         Returns:
             List[Dict[str, Any]]: 邮件信息列表
         """
-        if not self.imap_connection:
-            if not self.connect_imap():
-                return []
+        folder = folder or Config.DEFAULT_FOLDER
+        cached = {}
+        for email_id in email_ids:
+            email_info = self._get_cached_email(folder, email_id)
+            if email_info is not None:
+                email_info["original_uid"] = email_id
+                cached[email_id] = email_info
+        missing = [email_id for email_id in email_ids if email_id not in cached]
+        if not missing:
+            return [cached[email_id] for email_id in email_ids]
+
+        if not self._ensure_imap_connection():
+            return []
 
         try:
-            folder = folder or Config.DEFAULT_FOLDER
-            self.imap_connection.select(folder)
+            if not self._select_folder(folder):
+                return []
+
+            # 一次 FETCH 获取全部未缓存的邮件，而不是逐封请求
+            fetched = self._fetch_many(missing, lightweight=False)
+            if not fetched and not cached:
+                return []
+            fetched = fetched or {}
 
             emails = []
             for email_id in email_ids:
-                email_info = self.get_email(email_id)
-                if email_info:
-                    email_info["original_uid"] = email_id
-                    emails.append(email_info)
+                if email_id in cached:
+                    emails.append(cached[email_id])
+                    continue
+
+                entry = fetched.get(email_id.encode())
+                if entry is None:
+                    print(f"✗ 获取邮件失败: {email_id}")
+                    continue
+
+                flags_data, raw_email = entry
+                try:
+                    email_info = self._build_email_info(
+                        email_id, raw_email, flags_data, lightweight=False
+                    )
+                except Exception as e:
+                    print(f"✗ 解析邮件异常: {email_id}, {str(e)}")
+                    continue
+
+                email_info["original_uid"] = email_id
+                self._put_cached_email(folder, email_id, email_info)
+                emails.append(email_info)
 
             return emails
 
         except Exception as e:
             print(f"✗ 批量获取邮件异常: {str(e)}")
+            self._handle_imap_error(e)
             return []
 
+    @_imap_locked
     def get_emails_by_indices(
         self, indices: List[int], count: int = 50, folder: str = None
     ) -> List[Dict[str, Any]]:
         """
         根据时间排序的索引列表批量获取邮件
 
+        只搜索到 max(indices) 为止，并且只 FETCH 被请求的邮件
+
         Args:
             indices: 时间排序的索引列表（从1开始）
-            count: 获取的邮件总数（用于确保索引在范围内）
+            count: 保留以兼容旧调用，不再决定获取的邮件数量
             folder: 邮件文件夹，默认为收件箱
 
         Returns:
             List[Dict[str, Any]]: 邮件信息列表
         """
-        # 获取足够多的邮件以确保所有索引都在范围内
-        max_index = max(indices) if indices else 0
-        emails = self.get_recent_emails(count=max(count, max_index), folder=folder)
+        valid_indices = [index for index in indices if index >= 1]
+        if not valid_indices:
+            return []
 
-        if not emails:
+        if not self._ensure_imap_connection():
             return []
 
-        # 根据索引提取邮件
-        result = []
-        for index in indices:
-            if 1 <= index <= len(emails):
-                result.append(emails[index - 1])
+        try:
+            folder = folder or Config.DEFAULT_FOLDER
+            recent_ids = self._list_recent_ids(max(valid_indices), 30, folder)
 
-        return result
+            # 索引 -> 邮件ID，超出范围的索引直接忽略
+            targets = {
+                index: recent_ids[index - 1]
+                for index in valid_indices
+                if index <= len(recent_ids)
+            }
+            if not targets:
+                return []
+
+            fetched = self._fetch_many(
+                [email_id.decode() for email_id in set(targets.values())],
+                lightweight=True,
+            )
+            if fetched is None:
+                print("✗ 获取邮件列表失败")
+                return []
+
+            result = []
+            for index in indices:
+                email_id = targets.get(index)
+                if email_id is None:
+                    continue
+                email_info = self._build_listing_info(email_id, index, fetched)
+                if email_info:
+                    result.append(email_info)
+
+            return result
+
+        except Exception as e:
+            print(f"✗ 根据索引获取邮件异常: {str(e)}")
+            self._handle_imap_error(e)
+            return []
 
     def batch_forward_email(
         self, original_email: Dict[str, Any], recipients: List[str]
@@ -976,33 +2132,104 @@ Subject: {original_email["subject"]}
         Returns:
             Dict[str, Any]: 包含成功和失败信息的字典
         """
-        success_count = 0
-        failed_count = 0
-        results = []
+        if not recipients:
+            return _batch_summary([], "success")
+
+        # 转发内容对所有收件人都相同，只构建和编码一次，各收件人只补上 To 头部
+        try:
+            base_msg = self._build_forward(original_email, None)
+        except Exception as e:
+            status = f"error: {str(e)}"
+            return _batch_summary(
+                [{"recipient": recipient, "status": status} for recipient in recipients],
+                "success",
+            )
 
-        for recipient in recipients:
+        # 多个线程并发发送，每个线程从连接池取用自己的 SMTP 连接并在多封邮件间复用
+        pool = _SMTPConnectionPool(self._open_smtp_connection)
+        workers = min(len(recipients), self._FORWARD_MAX_WORKERS)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # map 按提交顺序返回结果，与 recipients 一一对应
+                results = list(
+                    executor.map(
+                        lambda recipient: self._forward_with_pool(
+                            pool, original_email, base_msg, recipient
+                        ),
+                        recipients,
+                    )
+                )
+        finally:
+            pool.close()
+
+        # 逐个收件人的结果只记 DEBUG/WARNING 日志，控制台只输出汇总
+        summary = _batch_summary(results, "success")
+        print(f"✓ 批量转发完成: {summary['success']}/{summary['total']} 成功")
+        return summary
+
+    def _forward_with_pool(
+        self,
+        pool: _SMTPConnectionPool,
+        original_email: Dict[str, Any],
+        base_msg: bytes,
+        recipient: str,
+    ) -> Dict[str, str]:
+        """
+        使用连接池中的连接转发一封邮件（批量转发的工作线程）
+
+        连接断开时丢弃该连接并重连重试一次
+
+        Args:
+            pool: SMTP 连接池
+            original_email: 原始邮件信息
+            base_msg: 不含 To 头部的转发邮件内容
+            recipient: 收件人
+
+        Returns:
+            Dict[str, str]: 该收件人的发送结果
+        """
+        try:
+            if recipient.isascii() and "\r" not in recipient and "\n" not in recipient:
+                msg = b"To: " + recipient.encode() + b"\r\n" + base_msg
+            else:
+                # 非 ASCII 地址需要编码，走完整构建流程
+                msg = self._build_forward(original_email, recipient)
+        except Exception as e:
+            return {"recipient": recipient, "status": f"error: {str(e)}"}
+
+        for attempt in range(2):
             try:
-                # 为每个收件人重新建立SMTP连接（避免连接超时）
-                if self.smtp_connection:
-                    self.disconnect_smtp()
-
-                success = self.forward_email(original_email, recipient)
-                if success:
-                    success_count += 1
-                    results.append({"recipient": recipient, "status": "success"})
-                else:
-                    failed_count += 1
-                    results.append({"recipient": recipient, "status": "failed"})
+                conn = pool.acquire()
             except Exception as e:
-                failed_count += 1
-                results.append({"recipient": recipient, "status": f"error: {str(e)}"})
+                _log.warning("转发邮件失败: %s, %s", recipient, e)
+                return {"recipient": recipient, "status": f"error: {str(e)}"}
 
-        return {
-            "total": len(recipients),
-            "success": success_count,
-            "failed": failed_count,
-            "results": results,
-        }
+            try:
+                refused = _pipelined_sendmail(conn, self.email_account, [recipient], msg)
+            except Exception as e:
+                # SMTP 异常都是 OSError 的子类，除连接断开外都是服务器拒绝等错误，连接仍可用
+                connection_lost = isinstance(
+                    e, smtplib.SMTPServerDisconnected
+                ) or not isinstance(e, smtplib.SMTPException)
+                if not connection_lost:
+                    pool.release(conn)
+                else:
+                    pool.discard(conn)
+                    if attempt == 0:
+                        continue
+                _log.warning("转发邮件失败: %s, %s", recipient, e)
+                return {"recipient": recipient, "status": f"error: {str(e)}"}
+
+            pool.release(conn)
+            if refused:
+                for error in refused.values():
+                    _log.warning("转发邮件失败: %s, %s", recipient, error)
+                return {"recipient": recipient, "status": "failed"}
+
+            _log.debug("邮件已转发到: %s", recipient)
+            return {"recipient": recipient, "status": "success"}
+
+        return {"recipient": recipient, "status": "failed"}
 
     def batch_archive_emails(
         self, email_ids: List[str], folder_name: str
@@ -1017,29 +2244,10 @@ Subject: {original_email["subject"]}
         Returns:
             Dict[str, Any]: 包含成功和失败信息的字典
         """
-        success_count = 0
-        failed_count = 0
-        results = []
-
-        for email_id in email_ids:
-            try:
-                success = self.archive_email_to_folder(email_id, folder_name)
-                if success:
-                    success_count += 1
-                    results.append({"email_id": email_id, "status": "archived"})
-                else:
-                    failed_count += 1
-                    results.append({"email_id": email_id, "status": "failed"})
-            except Exception as e:
-                failed_count += 1
-                results.append({"email_id": email_id, "status": f"error: {str(e)}"})
-
-        return {
-            "total": len(email_ids),
-            "success": success_count,
-            "failed": failed_count,
-            "results": results,
-        }
+        # 一次 COPY / STORE / EXPUNGE 处理全部邮件，结果对所有邮件一致
+        status = "archived" if self.archive_emails_to_folder(email_ids, folder_name) else "failed"
+        results = [{"email_id": email_id, "status": status} for email_id in email_ids]
+        return _batch_summary(results, "archived")
 
     def batch_delete_emails(self, email_ids: List[str]) -> Dict[str, Any]:
         """
@@ -1051,29 +2259,45 @@ Subject: {original_email["subject"]}
         Returns:
             Dict[str, Any]: 包含成功和失败信息的字典
         """
-        success_count = 0
-        failed_count = 0
-        results = []
+        # 一次 STORE / EXPUNGE 处理全部邮件，结果对所有邮件一致
+        status = "deleted" if self.delete_emails(email_ids) else "failed"
+        results = [{"email_id": email_id, "status": status} for email_id in email_ids]
+        return _batch_summary(results, "deleted")
+
+    def _batch_mark(
+        self,
+        email_ids: List[str],
+        mark_all: Callable[[List[str]], bool],
+        mark_one: Callable[[str], bool],
+        ok_status: str,
+    ) -> Dict[str, Any]:
+        """
+        批量修改邮件标记：先用一条 STORE 处理全部邮件，
+        失败时逐封重试（修改标记是幂等的）以找出失败的邮件
+
+        Args:
+            email_ids: 邮件ID列表
+            mark_all: 一次处理全部邮件的方法
+            mark_one: 处理单封邮件的方法
+            ok_status: 成功时的状态值
+
+        Returns:
+            Dict[str, Any]: 包含成功和失败信息的字典
+        """
+        if mark_all(email_ids):
+            results = [{"email_id": email_id, "status": ok_status} for email_id in email_ids]
+            return _batch_summary(results, ok_status)
 
+        results = []
         for email_id in email_ids:
             try:
-                success = self.delete_email(email_id)
-                if success:
-                    success_count += 1
-                    results.append({"email_id": email_id, "status": "deleted"})
-                else:
-                    failed_count += 1
-                    results.append({"email_id": email_id, "status": "failed"})
+                success = len(email_ids) > 1 and mark_one(email_id)
+                status = ok_status if success else "failed"
             except Exception as e:
-                failed_count += 1
-                results.append({"email_id": email_id, "status": f"error: {str(e)}"})
+                status = f"error: {str(e)}"
+            results.append({"email_id": email_id, "status": status})
 
-        return {
-            "total": len(email_ids),
-            "success": success_count,
-            "failed": failed_count,
-            "results": results,
-        }
+        return _batch_summary(results, ok_status)
 
     def batch_mark_as_read(self, email_ids: List[str]) -> Dict[str, Any]:
         """
@@ -1085,29 +2309,9 @@ Subject: {original_email["subject"]}
         Returns:
             Dict[str, Any]: 包含成功和失败信息的字典
         """
-        success_count = 0
-        failed_count = 0
-        results = []
-
-        for email_id in email_ids:
-            try:
-                success = self.mark_email_as_read(email_id)
-                if success:
-                    success_count += 1
-                    results.append({"email_id": email_id, "status": "marked_read"})
-                else:
-                    failed_count += 1
-                    results.append({"email_id": email_id, "status": "failed"})
-            except Exception as e:
-                failed_count += 1
-                results.append({"email_id": email_id, "status": f"error: {str(e)}"})
-
-        return {
-            "total": len(email_ids),
-            "success": success_count,
-            "failed": failed_count,
-            "results": results,
-        }
+        return self._batch_mark(
+            email_ids, self.mark_emails_as_read, self.mark_email_as_read, "marked_read"
+        )
 
     def batch_mark_as_unread(self, email_ids: List[str]) -> Dict[str, Any]:
         """
@@ -1119,33 +2323,20 @@ Subject: {original_email["subject"]}
         Returns:
             Dict[str, Any]: 包含成功和失败信息的字典
         """
-        success_count = 0
-        failed_count = 0
-        results = []
-
-        for email_id in email_ids:
-            try:
-                success = self.mark_email_as_unread(email_id)
-                if success:
-                    success_count += 1
-                    results.append({"email_id": email_id, "status": "marked_unread"})
-                else:
-                    failed_count += 1
-                    results.append({"email_id": email_id, "status": "failed"})
-            except Exception as e:
-                failed_count += 1
-                results.append({"email_id": email_id, "status": f"error: {str(e)}"})
+        return self._batch_mark(
+            email_ids, self.mark_emails_as_unread, self.mark_email_as_unread, "marked_unread"
+        )
 
-        return {
-            "total": len(email_ids),
-            "success": success_count,
-            "failed": failed_count,
-            "results": results,
-        }
 
+@functools.cache
+def get_client() -> EmailClient:
+    """
+    获取全局邮件客户端实例（首次调用时创建）
 
-# 创建全局邮件客户端实例
-email_client = EmailClient()
+    Returns:
+        EmailClient: 便捷函数共享的邮件客户端
+    """
+    return EmailClient()
 
 
 # ==================== 便捷函数 ====================
@@ -1153,62 +2344,62 @@ email_client = EmailClient()
 
 def get_email(email_id: str) -> Optional[Dict[str, Any]]:
     """获取邮件（便捷函数）"""
-    return email_client.get_email(email_id)
+    return get_client().get_email(email_id)
 
 
 def send_reply(email: Dict[str, Any], reply_content: str) -> bool:
     """发送回复（便捷函数）"""
-    return email_client.send_reply(email, reply_content)
+    return get_client().send_reply(email, reply_content)
 
 
 def archive_email_to_folder(email_id: str, folder_name: str) -> bool:
     """归档邮件（便捷函数）"""
-    return email_client.archive_email_to_folder(email_id, folder_name)
+    return get_client().archive_email_to_folder(email_id, folder_name)
 
 
 def delete_email(email_id: str) -> bool:
     """删除邮件（便捷函数）"""
-    return email_client.delete_email(email_id)
+    return get_client().delete_email(email_id)
 
 
 def forward_email(email: Dict[str, Any], forward_to: str) -> bool:
     """转发邮件（便捷函数）"""
-    return email_client.forward_email(email, forward_to)
+    return get_client().forward_email(email, forward_to)
 
 
 def get_emails_by_ids(email_ids: List[str]) -> List[Dict[str, Any]]:
     """批量获取邮件（便捷函数）"""
-    return email_client.get_emails_by_ids(email_ids)
+    return get_client().get_emails_by_ids(email_ids)
 
 
 def get_emails_by_indices(indices: List[int]) -> List[Dict[str, Any]]:
     """根据索引批量获取邮件（便捷函数）"""
-    return email_client.get_emails_by_indices(indices)
+    return get_client().get_emails_by_indices(indices)
 
 
 def batch_forward_email(email: Dict[str, Any], recipients: List[str]) -> Dict[str, Any]:
     """批量转发邮件（便捷函数）"""
-    return email_client.batch_forward_email(email, recipients)
+    return get_client().batch_forward_email(email, recipients)
 
 
 def batch_archive_emails(email_ids: List[str], folder_name: str) -> Dict[str, Any]:
     """批量归档邮件（便捷函数）"""
-    return email_client.batch_archive_emails(email_ids, folder_name)
+    return get_client().batch_archive_emails(email_ids, folder_name)
 
 
 def batch_delete_emails(email_ids: List[str]) -> Dict[str, Any]:
     """批量删除邮件（便捷函数）"""
-    return email_client.batch_delete_emails(email_ids)
+    return get_client().batch_delete_emails(email_ids)
 
 
 def batch_mark_as_read(email_ids: List[str]) -> Dict[str, Any]:
     """批量标记已读（便捷函数）"""
-    return email_client.batch_mark_as_read(email_ids)
+    return get_client().batch_mark_as_read(email_ids)
 
 
 def batch_mark_as_unread(email_ids: List[str]) -> Dict[str, Any]:
     """批量标记未读（便捷函数）"""
-    return email_client.batch_mark_as_unread(email_ids)
+    return get_client().batch_mark_as_unread(email_ids)
 
 
 if __name__ == "__main__":
@@ -4,17 +4,64 @@
 混合使用正则表达式和 DeepSeek API 进行参数提取
 """
 
+import copy
 import json
 import re
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from config import Config
-from deepseek import DeepSeekAPI
+from deepseek import DeepSeekAPI, _extract_json
+
+
+# 参数可以本地提取的意图：只需要单个邮件ID（列出邮件只需要数量）
+_LOCAL_PARAM_INTENTS = frozenset(
+    {
+        "reply_email",
+        "archive_email",
+        "delete_email",
+        "forward_email",
+        "mark_read",
+        "mark_unread",
+        "summarize_email",
+        "analyze_priority",
+        "generate_reply",
+        "list_emails",
+    }
+)
+
+# 本地参数提取用的正则：阿拉伯数字（"邮件3"、"第3封"、"3封"），以及不影响参数的填充词
+# 分组依次为 "第" 前缀、数字、"封" 后缀，用于区分序号和数量
+_LOCAL_NUMBER_RE = re.compile(r"(第)?(\d+)(封)?")
+_LOCAL_FILLER_RE = re.compile(r"请|帮我|帮忙|把|将|标记为|标记|这封|邮件|email|mail|到|给|和|、|[,，。.!！\s]")
+# 列出邮件时"最近10封"、"前10封"只表示数量
+_LOCAL_LIST_FILLER_RE = re.compile(r"最近|前|的")
+
+
+def _validate_id_list(email_ids: List[Any]) -> bool:
+    """
+    检查邮件ID列表是否都是有效ID（数字或 "latest"）
+
+    Args:
+        email_ids: 邮件ID列表
+
+    Returns:
+        bool: 是否全部有效
+    """
+    for email_id in email_ids:
+        email_id = str(email_id).strip()
+        if not (email_id.isdigit() or email_id == "latest"):
+            return False
+    return True
 
 
 class NLUEngine:
     """自然语言理解引擎"""
 
+    # 解析结果缓存的最大条目数
+    _PARSE_CACHE_SIZE = 256
+
     def __init__(self):
         """初始化 NLU 引擎"""
         self.deepseek_api = DeepSeekAPI()
@@ -54,62 +101,160 @@ class NLUEngine:
             "compose_email": ["写邮件", "撰写邮件", "发邮件", "发送邮件", "compose", "send email"],
         }
 
+        # 每个意图的关键词编译为一个正则（长关键词在前），按意图顺序依次检查，
+        # 保持"先定义的意图优先"的匹配规则，每个意图只需一次 C 层扫描
+        self._intent_keyword_regex: Dict[str, "re.Pattern[str]"] = {
+            intent: re.compile(
+                "|".join(
+                    re.escape(keyword.lower())
+                    for keyword in sorted(keywords, key=len, reverse=True)
+                )
+            )
+            for intent, keywords in self.intent_keywords.items()
+        }
+
+        # 邮箱地址匹配：后行断言让匹配只从本地部分的开头尝试，占有量词和逐段匹配的域名
+        # 不会回溯，findall 在长串无效输入上也是线性时间
         self.email_pattern = re.compile(
-            r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}(?:\.[A-Za-z]{2,})?"
+            r"(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]++@(?:[A-Za-z0-9-]++\.)+[A-Za-z]{2,}+"
         )
 
-    def parse_task(self, user_input: str) -> Dict[str, Any]:
+        # 解析结果缓存（LRU），重复输入直接命中，避免再次调用大模型
+        self._parse_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # 服务端在线程池中并发解析，缓存的读写需要加锁（大模型调用不在锁内）
+        self._parse_cache_lock = threading.Lock()
+
+    def clear_cache(self) -> None:
+        """清空解析结果缓存（意图或关键词变更后调用）"""
+        with self._parse_cache_lock:
+            self._parse_cache.clear()
+
+    def parse_task(
+        self, user_input: str, min_confidence: float = 0.0
+    ) -> Optional[Dict[str, Any]]:
         """
         解析用户输入的自然语言任务
 
+        Args:
+            user_input: 用户输入的自然语言文本
+            min_confidence: 最低置信度，未知意图且置信度低于此值时返回 None
+
+        Returns:
+            Optional[Dict[str, Any]]: 包含任务类型和参数的字典，无法识别时返回 None
+        """
+        result = self._parse_cached(user_input)
+
+        # 未知意图且置信度过低，视为无法识别
+        if (
+            result["intent"] == "unknown"
+            and result.get("confidence", 0) < min_confidence
+        ):
+            return None
+
+        return result
+
+    def _parse_cached(self, user_input: str) -> Dict[str, Any]:
+        """
+        经过 LRU 缓存解析用户输入
+
         Args:
             user_input: 用户输入的自然语言文本
 
         Returns:
             Dict[str, Any]: 包含任务类型和参数的字典
         """
+        # 规范化输入作为缓存键（只去除首尾空白，保留大小写以免影响内容参数）
+        cache_key = user_input.strip()
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(cache_key)
+            if cached is not None:
+                self._parse_cache.move_to_end(cache_key)
+        if cached is not None:
+            # 返回副本，调用方可能会修改参数字典
+            return copy.deepcopy(cached)
+
+        result, succeeded = self._parse_uncached(user_input)
+
+        # 只缓存成功的解析：大模型请求失败或响应无法解析时得到的是兜底结果，
+        # 缓存后一次网络抖动会让同一输入一直无法识别。大模型明确给出的未知意图照常缓存
+        if not succeeded:
+            return result
+
+        cached = copy.deepcopy(result)
+        with self._parse_cache_lock:
+            self._parse_cache[cache_key] = cached
+            self._parse_cache.move_to_end(cache_key)
+            if len(self._parse_cache) > self._PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+
+        return result
+
+    def _parse_uncached(self, user_input: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        不经过缓存解析用户输入
+
+        Args:
+            user_input: 用户输入的自然语言文本
+
+        Returns:
+            Tuple[Dict[str, Any], bool]: (包含任务类型和参数的字典, 解析是否成功)，
+                大模型请求失败或响应无法解析时为 False
+        """
+        # 只转换一次小写，关键词匹配和本地参数提取共用
+        user_input_lower = user_input.lower()
+
         # 先尝试快速匹配意图
-        quick_result = self._quick_match(user_input)
-        if quick_result and quick_result["intent"] != "unknown":
+        quick_result, succeeded = self._quick_match(user_input, user_input_lower)
+        if quick_result["intent"] != "unknown":
             print(f"✓ 快速匹配成功: {quick_result['intent']}")
-            return quick_result
+            return quick_result, succeeded
 
         # 使用大模型进行深度分析
         print("→ 使用大模型进行意图分析...")
-        result = self.analyze_intent(user_input)
-
-        return result
+        return self._analyze_intent(user_input)
 
-    def _quick_match(self, user_input: str) -> Optional[Dict[str, Any]]:
+    def _quick_match(
+        self, user_input: str, user_input_lower: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], bool]:
         """
         快速关键词匹配
 
         Args:
             user_input: 用户输入
+            user_input_lower: 用户输入的小写形式（调用方已转换时传入，避免重复转换）
 
         Returns:
-            Optional[Dict[str, Any]]: 匹配结果
+            Tuple[Dict[str, Any], bool]: (匹配结果, 参数提取是否成功)
         """
-        user_input_lower = user_input.lower()
-        # 遍历所有意图关键词
-        for intent, keywords in self.intent_keywords.items():
-            for keyword in keywords:
-                if keyword in user_input_lower:
-                    # 混合提取参数（正则 + DeepSeek）
-                    parameters = self._extract_parameters_hybrid(user_input, intent)
-                    return {
-                        "intent": intent,
-                        "parameters": parameters,
-                        "confidence": 0.8,
-                        "original_input": user_input,
-                    }
+        if user_input_lower is None:
+            user_input_lower = user_input.lower()
+        # 按意图顺序匹配，第一个包含其关键词的意图胜出
+        intent = next(
+            (
+                intent
+                for intent, keyword_regex in self._intent_keyword_regex.items()
+                if keyword_regex.search(user_input_lower)
+            ),
+            None,
+        )
+        if intent is not None:
+            # 混合提取参数（正则 + DeepSeek）
+            parameters, succeeded = self._extract_parameters_hybrid(
+                user_input, intent, user_input_lower
+            )
+            return {
+                "intent": intent,
+                "parameters": parameters,
+                "confidence": 0.8,
+                "original_input": user_input,
+            }, succeeded
 
         return {
             "intent": "unknown",
             "parameters": {},
             "confidence": 0.0,
             "original_input": user_input,
-        }
+        }, True
 
     def _extract_email_addresses(self, text: str) -> List[str]:
         """
@@ -121,28 +266,25 @@ class NLUEngine:
         Returns:
             List[str]: 邮箱地址列表
         """
-        emails = self.email_pattern.findall(text)
-        # 去重并保持顺序
-        seen = set()
-        unique_emails = []
-        for email in emails:
-            if email.lower() not in seen:
-                seen.add(email.lower())
-                unique_emails.append(email)
-        return unique_emails
+        # 按小写去重并保持顺序，保留第一次出现时的原始大小写
+        unique_emails: Dict[str, str] = {}
+        for email in self.email_pattern.findall(text):
+            unique_emails.setdefault(email.lower(), email)
+        return list(unique_emails.values())
 
     def _extract_parameters_hybrid(
-        self, user_input: str, intent: str
-    ) -> Dict[str, Any]:
+        self, user_input: str, intent: str, user_input_lower: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], bool]:
         """
         混合提取参数：正则表达式提取邮箱，DeepSeek提取其他参数
 
         Args:
             user_input: 用户输入
             intent: 识别出的意图
+            user_input_lower: 用户输入的小写形式（调用方已转换时传入，避免重复转换）
 
         Returns:
-            Dict[str, Any]: 提取的参数
+            Tuple[Dict[str, Any], bool]: (提取的参数, DeepSeek 参数提取是否成功)
         """
         parameters = {}
 
@@ -165,8 +307,19 @@ class NLUEngine:
                     if len(email_addresses) > 1:
                         parameters["recipients"] = email_addresses
 
-        # 2. 使用 DeepSeek 提取其他参数（邮件ID、数量、文件夹等）
-        deepseek_params = self._extract_parameters_deepseek(user_input, intent)
+        # 2. 简单句式本地提取参数，其余交给 DeepSeek（邮件ID、数量、文件夹等）
+        deepseek_params = self._extract_parameters_local(
+            user_input_lower or user_input.lower(), intent
+        )
+        succeeded = True
+        if deepseek_params is None:
+            deepseek_params = self._extract_parameters_deepseek(user_input, intent)
+            if deepseek_params is None:
+                # 请求失败或响应无法解析，只使用正则提取到的参数
+                deepseek_params = {}
+                succeeded = False
+        else:
+            print("→ 参数已本地提取，跳过大模型")
 
         # 3. 合并参数（DeepSeek的参数优先级更高，但不覆盖已提取的邮箱）
         for key, value in deepseek_params.items():
@@ -184,11 +337,65 @@ class NLUEngine:
         # 4. 后处理：确保参数格式正确
         parameters = self._post_process_parameters(parameters, intent)
 
-        return parameters
+        return parameters, succeeded
+
+    def _extract_parameters_local(
+        self, user_input_lower: str, intent: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        本地提取简单句式的参数（如"删除邮件3"、"回复最新的邮件"、"列出最近10封邮件"），
+        去掉关键词、邮箱地址、序号和填充词后没有剩余内容时才视为简单句式
+
+        Args:
+            user_input_lower: 用户输入的小写形式
+            intent: 识别出的意图
+
+        Returns:
+            Optional[Dict[str, Any]]: 提取的参数，句式不够简单时返回 None（交给 DeepSeek）
+        """
+        if intent not in _LOCAL_PARAM_INTENTS:
+            return None
+
+        text = self.email_pattern.sub(" ", user_input_lower)
+        # 只去掉匹配意图自身的关键词；还含有其他意图的关键词（如"查看邮件3的优先级"）
+        # 说明句子不止一个动作，交给 DeepSeek 判断
+        text = self._intent_keyword_regex[intent].sub(" ", text)
+        if any(
+            keyword_regex.search(text)
+            for other_intent, keyword_regex in self._intent_keyword_regex.items()
+            if other_intent != intent
+        ):
+            return None
+        if intent == "list_emails":
+            text = _LOCAL_LIST_FILLER_RE.sub(" ", text)
+
+        latest = "最新" in text
+        text = text.replace("最新的", " ").replace("最新", " ")
+        matches = _LOCAL_NUMBER_RE.findall(text)
+        numbers = [number for _, number, _ in matches]
+        text = _LOCAL_FILLER_RE.sub("", _LOCAL_NUMBER_RE.sub(" ", text))
+
+        # 不带"第"的"N封"是数量（"删除3封邮件"），不是邮件序号，交给 DeepSeek 判断批量操作
+        if intent != "list_emails" and any(
+            not ordinal and unit for ordinal, _, unit in matches
+        ):
+            return None
+
+        # 还有其他内容（发件人、文件夹、"前N封"批量操作等）或序号不唯一，交给 DeepSeek
+        if text or len(numbers) > 1 or (numbers and latest):
+            return None
+
+        if intent == "list_emails":
+            return {"count": int(numbers[0])} if numbers else {}
+        if numbers:
+            return {"email_id": numbers[0], "batch_operation": False}
+        if latest:
+            return {"email_id": "latest", "batch_operation": False}
+        return None
 
     def _extract_parameters_deepseek(
         self, user_input: str, intent: str
-    ) -> Dict[str, Any]:
+    ) -> Optional[Dict[str, Any]]:
         """
         使用DeepSeek深度分析提取参数（不包括邮箱地址）
 
@@ -197,7 +404,7 @@ class NLUEngine:
             intent: 识别出的意图
 
         Returns:
-            Dict[str, Any]: 提取的参数
+            Optional[Dict[str, Any]]: 提取的参数，请求失败或响应无法解析时返回 None
         """
         # 构建提示词
         prompt = f"""请从以下用户输入中提取与"{intent}"意图相关的参数：
@@ -265,18 +472,15 @@ class NLUEngine:
 
         if response:
             try:
-                # 提取JSON内容
-                start_idx = response.find("{")
-                end_idx = response.rfind("}") + 1
-                if start_idx != -1 and end_idx > start_idx:
-                    json_str = response[start_idx:end_idx]
-                    result = json.loads(json_str)
+                # 从第一个 "{" 开始解码，对象结束即停止
+                result = _extract_json(response)
+                if result is not None:
                     return result
             except json.JSONDecodeError as e:
                 print(f"✗ 解析DeepSeek响应失败: {str(e)}")
-                return {}
+                return None
 
-        return {}
+        return None
 
     def _post_process_parameters(
         self, parameters: Dict[str, Any], intent: str
@@ -346,6 +550,19 @@ class NLUEngine:
         Returns:
             Dict[str, Any]: 包含意图和参数的字典
         """
+        return self._analyze_intent(user_input)[0]
+
+    def _analyze_intent(self, user_input: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        使用大模型分析用户输入的任务意图，同时返回分析是否成功
+
+        Args:
+            user_input: 用户输入的自然语言
+
+        Returns:
+            Tuple[Dict[str, Any], bool]: (包含意图和参数的字典, 分析是否成功)，
+                请求失败或响应无法解析时返回默认结果和 False
+        """
         # 构建提示词
         intent_list = "\n".join(
             [f"- {key}: {value}" for key, value in self.supported_intents.items()]
@@ -392,13 +609,9 @@ class NLUEngine:
 
         if response:
             try:
-                # 提取JSON内容
-                start_idx = response.find("{")
-                end_idx = response.rfind("}") + 1
-                if start_idx != -1 and end_idx > start_idx:
-                    json_str = response[start_idx:end_idx]
-                    result = json.loads(json_str)
-
+                # 从第一个 "{" 开始解码，对象结束即停止
+                result = _extract_json(response)
+                if result is not None:
                     # 验证意图是否有效
                     if result.get("intent") not in self.supported_intents:
                         result["intent"] = "unknown"
@@ -421,16 +634,16 @@ class NLUEngine:
                     # 添加原始输入
                     result["original_input"] = user_input
 
-                    return result
+                    return result, True
                 else:
                     print("✗ 响应中未找到有效的JSON格式")
-                    return self._get_default_result(user_input)
+                    return self._get_default_result(user_input), False
             except json.JSONDecodeError as e:
                 print(f"✗ 解析意图分析结果失败: {str(e)}")
                 print(f"原始响应: {response}")
-                return self._get_default_result(user_input)
+                return self._get_default_result(user_input), False
 
-        return self._get_default_result(user_input)
+        return self._get_default_result(user_input), False
 
     def _get_default_result(self, user_input: str) -> Dict[str, Any]:
         """
@@ -483,6 +696,11 @@ class NLUEngine:
         if intent not in required_params:
             return True, ""  # 未知意图不验证
 
+        # 多个邮件ID时先检查格式，避免无效ID逐个请求IMAP服务器
+        email_ids = parameters.get("email_ids")
+        if isinstance(email_ids, list) and not _validate_id_list(email_ids):
+            return False, f"无效的邮件ID列表: {', '.join(map(str, email_ids))}"
+
         # 特殊处理：批量操作
         if parameters.get("batch_operation") == True:
             # 批量操作需要count参数
@@ -535,17 +753,20 @@ nlu_engine = NLUEngine()
 # ==================== 便捷函数 ====================
 
 
-def parse_task(user_input: str) -> Dict[str, Any]:
+def parse_task(
+    user_input: str, min_confidence: float = 0.0
+) -> Optional[Dict[str, Any]]:
     """
     解析用户任务（便捷函数）
 
     Args:
         user_input: 用户输入
+        min_confidence: 最低置信度
 
     Returns:
-        Dict[str, Any]: 解析结果
+        Optional[Dict[str, Any]]: 解析结果
     """
-    return nlu_engine.parse_task(user_input)
+    return nlu_engine.parse_task(user_input, min_confidence)
 
 
 def analyze_intent(user_input: str) -> Dict[str, Any]:
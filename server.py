@@ -124,8 +124,10 @@ async def check_auth():
         }
     return {"authenticated": False, "accounts": []}
 
+# 下面的接口会阻塞在 IMAP/SMTP/大模型请求上，定义为普通函数，
+# 由 FastAPI 放到线程池中执行，避免一个慢请求阻塞整个事件循环
 @app.post("/api/logout")
-async def logout(email: Optional[str] = None):
+def logout(email: Optional[str] = None):
     """Logout from one or all accounts"""
     global task_executors
     
@@ -151,7 +153,7 @@ async def logout(email: Optional[str] = None):
         return {"success": True, "message": "Logged out from all accounts"}
 
 @app.post("/api/login")
-async def login(request: LoginRequest):
+def login(request: LoginRequest):
     global task_executors
     
     # Determine server settings
@@ -193,7 +195,7 @@ async def login(request: LoginRequest):
         raise HTTPException(status_code=500, detail=f"Login error: {str(e)}")
 
 @app.post("/api/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+def chat(request: ChatRequest):
     if not nlu_engine:
         raise HTTPException(status_code=503, detail="NLU engine not initialized")
         
@@ -260,7 +262,7 @@ async def chat(request: ChatRequest):
     )
 
 @app.get("/api/folders")
-async def get_folders(email: Optional[str] = None):
+def get_folders(email: Optional[str] = None):
     """List all available email folders for the specified account"""
     if not task_executors:
         raise HTTPException(status_code=401, detail="Please login first")
@@ -284,7 +286,7 @@ async def get_folders(email: Optional[str] = None):
         raise HTTPException(status_code=500, detail=f"Error listing folders: {str(e)}")
 
 @app.get("/api/emails")
-async def get_emails(
+def get_emails(
     email: Optional[str] = None, 
     days: int = 30, 
     limit: int = 20, 
@@ -321,7 +323,7 @@ async def get_emails(
         raise HTTPException(status_code=500, detail=f"Error fetching emails: {str(e)}")
 
 @app.post("/api/send-email")
-async def send_email(request: SendEmailRequest):
+def send_email(request: SendEmailRequest):
     """Send an email using the specified account"""
     if not task_executors:
         raise HTTPException(status_code=401, detail="Please login first")
@@ -359,7 +361,7 @@ async def send_email(request: SendEmailRequest):
         raise HTTPException(status_code=500, detail=f"Error sending email: {str(e)}")
 
 @app.post("/api/generate/compose")
-async def generate_compose_content(request: EmailOperationRequest):
+def generate_compose_content(request: EmailOperationRequest):
     """生成新邮件的内容（预览阶段）"""
     if not task_executors:
         raise HTTPException(status_code=401, detail="Please login first")
@@ -406,7 +408,7 @@ async def generate_compose_content(request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/compose")
-async def compose_email(request: EmailOperationRequest):
+def compose_email(request: EmailOperationRequest):
     """发送新邮件（用于预览确认后的发送）"""
     if not task_executors:
         raise HTTPException(status_code=401, detail="Please login first")
@@ -447,7 +449,7 @@ async def compose_email(request: EmailOperationRequest):
 # ==================== 单邮件操作接口 ====================
 
 @app.get("/api/emails/{email_id}")
-async def get_email_detail(email_id: str, email: Optional[str] = None):
+def get_email_detail(email_id: str, email: Optional[str] = None):
     """Get detailed information of a specific email"""
     executor = _get_executor(email)
     try:
@@ -460,7 +462,7 @@ async def get_email_detail(email_id: str, email: Optional[str] = None):
         raise HTTPException(status_code=500, detail=f"Error fetching email: {str(e)}")
 
 @app.post("/api/emails/{email_id}/reply")
-async def reply_email(email_id: str, request: EmailOperationRequest):
+def reply_email(email_id: str, request: EmailOperationRequest):
     """Reply to an email"""
     executor = _get_executor(request.email)
     
@@ -478,7 +480,7 @@ async def reply_email(email_id: str, request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/reply")
-async def reply_email_direct(request: EmailOperationRequest):
+def reply_email_direct(request: EmailOperationRequest):
     """直接回复邮件（用于预览确认后的回复）"""
     executor = _get_executor(request.email)
     
@@ -510,7 +512,7 @@ async def reply_email_direct(request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error replying email: {str(e)}")
 
 @app.post("/api/emails/{email_id}/forward")
-async def forward_email(email_id: str, request: EmailOperationRequest):
+def forward_email(email_id: str, request: EmailOperationRequest):
     """Forward an email to recipients"""
     executor = _get_executor(request.email)
     try:
@@ -525,7 +527,7 @@ async def forward_email(email_id: str, request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error forwarding email: {str(e)}")
 
 @app.post("/api/emails/{email_id}/archive")
-async def archive_email(email_id: str, request: EmailOperationRequest):
+def archive_email(email_id: str, request: EmailOperationRequest):
     """Archive an email to a folder"""
     executor = _get_executor(request.email)
     try:
@@ -539,7 +541,7 @@ async def archive_email(email_id: str, request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error archiving email: {str(e)}")
 
 @app.delete("/api/emails/{email_id}")
-async def delete_email(email_id: str, email: Optional[str] = None):
+def delete_email(email_id: str, email: Optional[str] = None):
     """Delete an email"""
     executor = _get_executor(email)
     try:
@@ -550,7 +552,7 @@ async def delete_email(email_id: str, email: Optional[str] = None):
         raise HTTPException(status_code=500, detail=f"Error deleting email: {str(e)}")
 
 @app.patch("/api/emails/{email_id}/mark")
-async def mark_email(email_id: str, request: EmailOperationRequest):
+def mark_email(email_id: str, request: EmailOperationRequest):
     """Mark an email as read or unread"""
     executor = _get_executor(request.email)
     try:
@@ -564,7 +566,7 @@ async def mark_email(email_id: str, request: EmailOperationRequest):
 # ==================== AI辅助接口 ====================
 
 @app.post("/api/emails/{email_id}/summarize")
-async def summarize_email(email_id: str, request: EmailOperationRequest):
+def summarize_email(email_id: str, request: EmailOperationRequest):
     """Generate summary for an email"""
     executor = _get_executor(request.email)
     try:
@@ -575,7 +577,7 @@ async def summarize_email(email_id: str, request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error summarizing email: {str(e)}")
 
 @app.post("/api/emails/{email_id}/analyze-priority")
-async def analyze_priority(email_id: str, request: EmailOperationRequest):
+def analyze_priority(email_id: str, request: EmailOperationRequest):
     """Analyze email priority"""
     executor = _get_executor(request.email)
     try:
@@ -586,7 +588,7 @@ async def analyze_priority(email_id: str, request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error analyzing priority: {str(e)}")
 
 @app.post("/api/emails/{email_id}/generate-reply")
-async def generate_reply(email_id: str, request: EmailOperationRequest):
+def generate_reply(email_id: str, request: EmailOperationRequest):
     """Generate automatic reply content"""
     executor = _get_executor(request.email)
     try:
@@ -602,7 +604,7 @@ async def generate_reply(email_id: str, request: EmailOperationRequest):
 # ==================== 批量操作接口 ====================
 
 @app.post("/api/emails/batch/archive")
-async def batch_archive(request: EmailOperationRequest):
+def batch_archive(request: EmailOperationRequest):
     """Batch archive emails"""
     executor = _get_executor(request.email)
     try:
@@ -616,7 +618,7 @@ async def batch_archive(request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error batch archiving: {str(e)}")
 
 @app.post("/api/emails/batch/delete")
-async def batch_delete(request: EmailOperationRequest):
+def batch_delete(request: EmailOperationRequest):
     """Batch delete emails"""
     executor = _get_executor(request.email)
     try:
@@ -627,7 +629,7 @@ async def batch_delete(request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error batch deleting: {str(e)}")
 
 @app.post("/api/emails/batch/forward")
-async def batch_forward(request: EmailOperationRequest):
+def batch_forward(request: EmailOperationRequest):
     """Batch forward emails"""
     executor = _get_executor(request.email)
     try:
@@ -641,7 +643,7 @@ async def batch_forward(request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error batch forwarding: {str(e)}")
 
 @app.post("/api/emails/batch/mark")
-async def batch_mark(request: EmailOperationRequest):
+def batch_mark(request: EmailOperationRequest):
     """Batch mark emails as read or unread"""
     executor = _get_executor(request.email)
     try:
@@ -653,7 +655,7 @@ async def batch_mark(request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error batch marking: {str(e)}")
 
 @app.post("/api/emails/batch/summarize")
-async def batch_summarize(request: EmailOperationRequest):
+def batch_summarize(request: EmailOperationRequest):
     """Batch summarize emails"""
     executor = _get_executor(request.email)
     try:
@@ -664,7 +666,7 @@ async def batch_summarize(request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error batch summarizing: {str(e)}")
 
 @app.post("/api/emails/batch/classify")
-async def batch_classify(request: EmailOperationRequest):
+def batch_classify(request: EmailOperationRequest):
     """Batch classify emails - returns classifications for all specified emails"""
     executor = _get_executor(request.email)
     try:
@@ -678,7 +680,7 @@ async def batch_classify(request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error batch classifying: {str(e)}")
 
 @app.post("/api/emails/search")
-async def search_emails(request: EmailOperationRequest):
+def search_emails(request: EmailOperationRequest):
     """Search emails by content and/or sender"""
     executor = _get_executor(request.email)
     try:
@@ -693,7 +695,7 @@ async def search_emails(request: EmailOperationRequest):
         raise HTTPException(status_code=500, detail=f"Error searching emails: {str(e)}")
 
 @app.post("/api/emails/detail")
-async def get_email_detail(request: EmailOperationRequest):
+def get_email_detail(request: EmailOperationRequest):
     """Get email detail by ID"""
     executor = _get_executor(request.email)
     try:
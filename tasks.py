@@ -904,28 +904,24 @@ class TaskExecutor:
 
         print(f"→ 找到 {len(emails)} 封邮件，正在生成批量摘要...")
 
-        # 为每封邮件生成摘要
+        # 并发为每封邮件生成摘要
+        results = self.deepseek_api.map_concurrently(
+            self.deepseek_api.summarize_email_content,
+            [email["body"] for email in emails],
+        )
+
         summaries = []
-        for i, email in enumerate(emails, 1):
-            try:
-                summary = self.deepseek_api.summarize_email_content(email["body"])
-                summaries.append(
-                    {
-                        "index": i,
-                        "subject": email["subject"],
-                        "from": email["from"],
-                        "summary": summary,
-                    }
-                )
-            except Exception as e:
-                summaries.append(
-                    {
-                        "index": i,
-                        "subject": email["subject"],
-                        "from": email["from"],
-                        "summary": f"摘要生成失败: {str(e)}",
-                    }
-                )
+        for i, (email, summary) in enumerate(zip(emails, results), 1):
+            if isinstance(summary, Exception):
+                summary = f"摘要生成失败: {str(summary)}"
+            summaries.append(
+                {
+                    "index": i,
+                    "subject": email["subject"],
+                    "from": email["from"],
+                    "summary": summary,
+                }
+            )
 
         return {
             "success": True,
@@ -995,31 +991,41 @@ class TaskExecutor:
         classifications = []
         failed_count = 0
 
+        # 先逐封获取邮件（IMAP 连接不能并发使用）
+        fetched = []
         for email_id in email_ids:
             try:
-                # 获取邮件
                 email_info = self._get_email_by_id(email_id)
                 if not email_info:
                     print(f"✗ 未找到邮件: {email_id}")
                     failed_count += 1
                     continue
-
-                # 分析邮件内容
-                analysis_result = self.deepseek_api.analyze_email_content(email_info["body"])
-
-                classifications.append({
-                    "email_id": email_id,
-                    "subject": email_info["subject"],
-                    "from": email_info["from"],
-                    "classification": analysis_result,
-                })
-                
-                print(f"✓ 邮件 {email_id} 分类完成: {analysis_result.get('category', 'N/A')}")
-
+                fetched.append((email_id, email_info))
             except Exception as e:
                 print(f"✗ 分类邮件 {email_id} 失败: {str(e)}")
                 failed_count += 1
 
+        # 再并发分析邮件内容
+        results = self.deepseek_api.map_concurrently(
+            self.deepseek_api.analyze_email_content,
+            [email_info["body"] for _, email_info in fetched],
+        )
+
+        for (email_id, email_info), analysis_result in zip(fetched, results):
+            if isinstance(analysis_result, Exception):
+                print(f"✗ 分类邮件 {email_id} 失败: {str(analysis_result)}")
+                failed_count += 1
+                continue
+
+            classifications.append({
+                "email_id": email_id,
+                "subject": email_info["subject"],
+                "from": email_info["from"],
+                "classification": analysis_result,
+            })
+
+            print(f"✓ 邮件 {email_id} 分类完成: {analysis_result.get('category', 'N/A')}")
+
         success_count = len(classifications)
         total_count = len(email_ids)
 